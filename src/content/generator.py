@@ -1,10 +1,47 @@
 import os
+import io
 import json
+import hashlib
+import shutil
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
 from typing import Dict, List
-import textwrap # Import textwrap for easier multiline handling
 import re # Import regex for URL removal
+import bisect
+import mmap
+import threading
+import itertools
+import multiprocessing
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+# 기존 logger 설정을 따르거나 기본 로거 사용
+try:
+    from loguru import logger
+except ImportError:
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# orjson은 선택 사항 - 설치되어 있으면 표준 json보다 빠르게 파싱
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson은 선택 사항 - 설치되어 있으면 JSON 파일 전체를 메모리에 올리지 않고 게시물 단위로 스트리밍 파싱
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Numba는 선택 사항 - 설치되어 있으면 ASCII 줄바꿈 계산을 JIT 컴파일해서 사용
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # 색상 테마
 COLOR_CYAN = (0, 153, 153)
@@ -12,12 +49,127 @@ COLOR_RED = (255, 51, 51)
 COLOR_WHITE = (255, 255, 255)
 COLOR_BLACK = (0, 0, 0) # Add black for text for better contrast on white
 
+# 이미지로 취급할 URL (확장자 뒤에 쿼리스트링/프래그먼트 허용, 대소문자 무시)
+_IMG_URL_RE = re.compile(r'\.(?:jpe?g|png|gif)(?:$|[?#])', re.IGNORECASE)
+
+# 다운로드한 이미지 메모리 캐시 최대 개수
+_IMAGE_CACHE_SIZE = 64
+
+# 줄바꿈 결과 캐시 최대 개수
+_WRAP_CACHE_SIZE = 4096
+
+# 프레임에 붙이는 이미지의 최대 높이 (JPEG 축소 디코딩 기준으로도 사용)
+_MAX_MEDIA_HEIGHT = 600
+
+# 생성 이미지 저장 형식 (알파 채널이 없으므로 PNG 대신 빠른 JPEG 사용)
+IMAGE_EXT = '.jpg'
+_IMAGE_SAVE_OPTIONS = {'format': 'JPEG', 'quality': 90, 'optimize': False, 'progressive': False}
+
+# 디스크 프레임 캐시 키에 들어가는 버전 - 그리기/폰트/줄바꿈 코드가 바뀌어 프레임이 달라지면 올려서 기존 캐시를 무효화
+_FRAME_CACHE_VERSION = 1
+
+# URL 제거용 정규식 (http/https 또는 www.로 시작하는 URL)
+_URL_RE = re.compile(r'https?://\S+|www\.\S+')
+
+
+def _wrap_ascii_kernel(word_widths, tail_widths, space_width, max_width):
+    """
+    Greedy line accumulation over a paragraph's pre-measured words.
+
+    word_widths are the kerned font.getlength widths that ContentImageGenerator._wrap_text uses. A word wider
+    than max_width starts a new line whose width is its last broken piece (tail_widths), as in _wrap_text.
+    Returns the (first word, end word) indices of each line.
+    """
+    n = word_widths.shape[0]
+    bounds = np.empty((n, 2), dtype=np.int64)
+    count = 0
+    line_start = -1
+    line_width = 0.0
+    for k in range(n):
+        word_width = word_widths[k]
+        if word_width > max_width:
+            if line_start >= 0:
+                bounds[count, 0] = line_start
+                bounds[count, 1] = k
+                count += 1
+            line_start = k
+            line_width = tail_widths[k]
+            continue
+        needed_width = word_width if line_start < 0 else line_width + space_width + word_width
+        if needed_width <= max_width:
+            if line_start < 0:
+                line_start = k
+            line_width = needed_width
+        else:
+            bounds[count, 0] = line_start
+            bounds[count, 1] = k
+            count += 1
+            line_start = k
+            line_width = word_width
+    if line_start >= 0:
+        bounds[count, 0] = line_start
+        bounds[count, 1] = n
+        count += 1
+    return bounds[:count]
+
+
+# JIT 컴파일된 커널 (Numba가 없으면 None - 기존 getlength 기반 경로 사용)
+_wrap_ascii_kernel_jit = njit(cache=True, fastmath=True)(_wrap_ascii_kernel) if njit is not None else None
+
 class ContentImageGenerator:
-    def __init__(self, width=720, height=1280, font_path=None, output_dir="output/images"):
+    # (font_path, size) -> loaded font, shared across instances so each size is only loaded once per process
+    _font_cache: Dict[tuple, ImageFont.ImageFont] = {}
+    # Comment parts are rendered on worker threads, so font loading is serialized to parse each face once
+    _font_cache_lock = threading.Lock()
+
+    def __init__(self, width=720, height=1280, font_path=None, output_dir="output/images", min_comment_score=None,
+                 use_disk_cache=False, cache_dir=None):
         self.width = width
         self.height = height
         self.output_dir = output_dir
+        # Comments scoring below this are not rendered (None renders every comment)
+        self.min_comment_score = min_comment_score
+        # Opt-in: rendered frames are kept in a content-keyed disk cache so re-runs on the same JSON just copy them.
+        # Entries are never evicted, so point cache_dir at a shared directory and clear it by hand when needed.
+        self.use_disk_cache = use_disk_cache
+        self.cache_dir = cache_dir
         os.makedirs(output_dir, exist_ok=True)
+        # 레이아웃 상수 (프레임마다 다시 계산하지 않도록 미리 계산)
+        self._padding = 30
+        self._half_padding = self._padding // 2
+        self._header_height = 100
+        self._info_bar_height = 100
+        self._footer_space = 50
+        self._content_width = self.width - 2 * self._padding
+        self._info_bar_y = self.height - self._footer_space - self._info_bar_height
+        # Lowest y content may reach, one padding above the info bar
+        self._content_bottom_y = self._info_bar_y - self._padding
+        # post id -> image URL (or None), so each post is only inspected once
+        self._image_url_cache: Dict[str, str | None] = {}
+        # (text, font size, max width) -> wrapped lines, least recently used first
+        self._wrap_cache: "OrderedDict[tuple, List[str]]" = OrderedDict()
+        self._wrap_cache_lock = threading.Lock()
+        # font -> {character: width}
+        self._char_width_cache: Dict[ImageFont.ImageFont, Dict[str, float]] = {}
+        # font -> {word: width}, common words and author names repeat across comments
+        self._word_width_cache: Dict[ImageFont.ImageFont, Dict[str, float]] = {}
+        # font -> height of "A", which multiline_text uses as its line advance
+        self._a_height_cache: Dict[ImageFont.ImageFont, int] = {}
+        # font -> ASCII width lookup table
+        self._ascii_width_cache: Dict[ImageFont.ImageFont, np.ndarray] = {}
+        # Reusable full-size background canvas and scratch measurement draw context, one per thread
+        self._canvas_local = threading.local()
+        # Shared HTTP session (created on first download) and URL -> decoded image LRU cache
+        self._session = None
+        # Worker process pool for generate_from_json (created on first use, see _get_pool)
+        self._pool = None
+        self._pool_finalizer = None
+        # Thread pool for the parts of long comments (created on first use, see _get_part_executor)
+        self._part_executor = None
+        self._image_cache: "OrderedDict[str, Image.Image]" = OrderedDict()
+        self._image_cache_lock = threading.Lock()
+        # drawn post fields -> (header band, info bar band, base frame) for the post currently being rendered
+        self._band_cache: Dict[tuple, tuple] = {}
         # 기본 폰트 경로 (시스템 기본) - Fallback added
         if font_path is None:
              # Common paths for Arial Unicode on macOS, Windows, Linux
@@ -29,119 +181,283 @@ class ContentImageGenerator:
             ]
             self.font_path = next((path for path in common_font_paths if os.path.exists(path)), None)
             if not self.font_path:
-                 # Assuming logger is available from loguru import
-                 # If running this class standalone without main block, logger might not be configured
-                 try:
-                     from loguru import logger
-                     logger.warning("Arial Unicode or Liberation Sans not found. Using default font.")
-                 except ImportError:
-                     print("Warning: Arial Unicode or Liberation Sans not found and loguru not available. Using default font.")
+                 logger.warning("Arial Unicode or Liberation Sans not found. Using default font.")
 
         else:
             self.font_path = font_path
 
     def _get_font(self, size=40, bold=False):
+        key = (self.font_path, size)
+        font = self._font_cache.get(key)
+        if font is not None:
+            return font
+        with self._font_cache_lock:
+            font = self._font_cache.get(key)
+            if font is None:
+                font = self._load_font(size)
+                self._font_cache[key] = font
+        return font
+
+    def _load_font(self, size):
         try:
             if self.font_path:
                 # PIL doesn't directly support bold styles via truetype, need bold font file if available
                 # For simplicity, just return the requested size for now.
                 return ImageFont.truetype(self.font_path, size)
         except Exception:
-             # Assuming logger is available from loguru import
-             try:
-                 from loguru import logger
-                 logger.warning(f"Could not load font from {self.font_path}. Using default font.")
-             except ImportError:
-                  print(f"Warning: Could not load font from {self.font_path} and loguru not available. Using default font.")
+             logger.warning(f"Could not load font from {self.font_path}. Using default font.")
 
              pass
-        return ImageFont.load_default()
+        # Default font does not depend on size, cache it once under a shared key
+        font = self._font_cache.get((None, 0))
+        if font is None:
+            font = ImageFont.load_default()
+            self._font_cache[(None, 0)] = font
+        return font
 
     def _wrap_text(self, text, font, max_width):
-        # Use textwrap for simple wrapping
-        # Estimate average character width for textwrap width calculation
-        # This is a heuristic, true width depends on font and specific characters
-        avg_char_width = font.size // 2 # Rough estimate
-        chars_per_line = max_width // avg_char_width if avg_char_width > 0 else max_width
-        chars_per_line = max(1, chars_per_line) # Ensure at least 1 char per line
-
-        wrapper = textwrap.TextWrapper(width=chars_per_line, break_long_words=True)
+        # The same title/body is wrapped for every frame of a post, reuse the result
+        cache_key = (text, font.size, max_width)
+        with self._wrap_cache_lock:
+            cached = self._wrap_cache.get(cache_key)
+            if cached is not None:
+                self._wrap_cache.move_to_end(cache_key)
+                return list(cached)
+
+        # Measure each word once and accumulate line widths instead of re-measuring the growing line
+        space_width = font.getlength(' ')
+        word_widths = self._get_word_widths(font)
         lines = []
         for paragraph in text.split('\n'):
-             # Also handle wrapping of very long lines within the paragraph
+            if _wrap_ascii_kernel_jit is not None and paragraph.isascii():
+                lines.extend(self._wrap_ascii_paragraph(paragraph, font, max_width, space_width, word_widths))
+                continue
             sub_lines = []
-            current_line = ''
-            words = paragraph.split(' ')
-            for word in words:
-                 test_line = (current_line + ' ' + word).strip()
-                 # Use a dummy draw context for textbbox without drawing
-                 temp_img = Image.new('RGB', (1, 1))
-                 temp_draw = ImageDraw.Draw(temp_img)
-                 bbox = temp_draw.textbbox((0, 0), test_line, font=font)
-                 text_width = bbox[2] - bbox[0]
-                 if text_width <= max_width:
-                     current_line = test_line
-                 else:
-                     sub_lines.append(current_line)
-                     current_line = word
-            if current_line:
-                sub_lines.append(current_line)
+            current_words = []
+            current_width = 0
+            for word in paragraph.split(' '):
+                if not word:
+                    continue
+                word_width = word_widths.get(word)
+                if word_width is None:
+                    word_width = word_widths[word] = font.getlength(word)
+                if word_width > max_width:
+                    # Word alone is wider than the line, break it by characters
+                    if current_words:
+                        sub_lines.append(' '.join(current_words))
+                    pieces = self._break_long_word(word, font, max_width)
+                    sub_lines.extend(pieces[:-1])
+                    current_words = [pieces[-1]]
+                    current_width = font.getlength(pieces[-1])
+                    continue
+                needed_width = word_width if not current_words else current_width + space_width + word_width
+                if needed_width <= max_width:
+                    current_words.append(word)
+                    current_width = needed_width
+                else:
+                    sub_lines.append(' '.join(current_words))
+                    current_words = [word]
+                    current_width = word_width
+            if current_words:
+                sub_lines.append(' '.join(current_words))
             lines.extend(sub_lines)
 
+        with self._wrap_cache_lock:
+            self._wrap_cache[cache_key] = lines
+            if len(self._wrap_cache) > _WRAP_CACHE_SIZE:
+                self._wrap_cache.popitem(last=False)
+        return list(lines)
+
+    def _wrap_ascii_paragraph(self, paragraph, font, max_width, space_width, word_widths):
+        """Wraps an ASCII paragraph with the Numba kernel, using the same kerned word widths as the Python path."""
+        words = [word for word in paragraph.split(' ') if word]
+        widths = np.empty(len(words), dtype=np.float64)
+        tail_widths = np.zeros(len(words), dtype=np.float64)
+        long_word_pieces = {}
+        for k, word in enumerate(words):
+            word_width = word_widths.get(word)
+            if word_width is None:
+                word_width = word_widths[word] = font.getlength(word)
+            widths[k] = word_width
+            if word_width > max_width:
+                pieces = long_word_pieces[k] = self._break_long_word(word, font, max_width)
+                tail_widths[k] = font.getlength(pieces[-1])
+        lines = []
+        for start, end in _wrap_ascii_kernel_jit(widths, tail_widths, float(space_width), float(max_width)):
+            line_words = words[start:end]
+            pieces = long_word_pieces.get(start)
+            if pieces is not None:
+                # The line starts with a word broken by characters, its leading pieces get lines of their own
+                lines.extend(pieces[:-1])
+                line_words[0] = pieces[-1]
+            lines.append(' '.join(line_words))
         return lines
 
+    def _break_long_word(self, word, font, max_width):
+        """Splits a word wider than max_width into pieces that each fit on a line."""
+        char_widths = self._get_char_widths(font)
+        pieces = []
+        current = ''
+        current_width = 0
+        for char in word:
+            char_width = char_widths.get(char)
+            if char_width is None:
+                char_width = char_widths[char] = font.getlength(char)
+            if current and current_width + char_width > max_width:
+                pieces.append(current)
+                current = ''
+                current_width = 0
+            current += char
+            current_width += char_width
+        if current:
+            pieces.append(current)
+        return pieces
+
     def _draw_multiline(self, draw, text, pos, font, fill, max_width, max_lines=None, line_spacing=10):
         # 텍스트를 max_width에 맞게 줄바꿈하여 여러 줄로 그림
+        lines, _ = self._measure_multiline(text, font, max_width, max_lines, line_spacing)
+        return self._blit_multiline(draw, lines, pos, font, fill, line_spacing) # Return the final y position after drawing
+
+    def _measure_multiline(self, text, font, max_width, max_lines=None, line_spacing=10):
+        """Wraps text, truncating it with an ellipsis past max_lines, and returns (lines, total_height)."""
         lines = self._wrap_text(text, font, max_width)
 
         if max_lines is not None and len(lines) > max_lines:
             lines = lines[:max_lines]
-            # Add ellipsis to the last line
-            last_line = lines[-1]
-            ellipsis = "..."
-            
-            # Calculate space needed for ellipsis
-            # Use a dummy draw context for textbbox without drawing
-            temp_img = Image.new('RGB', (1, 1))
-            temp_draw = ImageDraw.Draw(temp_img)
-            ellipsis_bbox = temp_draw.textbbox((0,0), ellipsis, font=font)
-            ellipsis_width = ellipsis_bbox[2] - ellipsis_bbox[0]
-
-            # Calculate space available on the last line for text before ellipsis
-            available_width = max_width - ellipsis_width
-
-            # Truncate the last line if needed to fit the ellipsis
-            while True:
-                bbox = draw.textbbox((0, 0), last_line, font=font)
-                text_width = bbox[2] - bbox[0]
-                if text_width <= available_width or len(last_line) == 0:
-                    break
-                last_line = last_line[:-1]
-
-            lines[-1] = last_line.strip() + ellipsis
-
-
-        y = pos[1]
-        drawn_lines_count = 0
-        for line in lines:
-            if max_lines is not None and drawn_lines_count >= max_lines: # Double check max lines limit
-                 break
-            draw.text((pos[0], y), line, font=font, fill=fill)
-            y += font.size + line_spacing
-            drawn_lines_count += 1
-            
-        return y # Return the final y position after drawing
+            if lines:
+                # Add ellipsis to the last line
+                ellipsis = "..."
+                # Calculate space available on the last line for text before ellipsis
+                available_width = max_width - font.getlength(ellipsis)
+                lines[-1] = self._truncate_to_width(lines[-1], font, available_width).strip() + ellipsis
+
+        return lines, len(lines) * (font.size + line_spacing)
+
+    def _truncate_to_width(self, text, font, max_width):
+        """Returns the longest prefix of text whose width fits within max_width."""
+        if text.isascii():
+            # Vectorized path: look up every byte in the font's ASCII width table and cut at the cumsum
+            widths = self._get_ascii_widths(font)[np.frombuffer(text.encode('ascii'), dtype=np.uint8)]
+            return text[:int(np.searchsorted(np.cumsum(widths), max_width, side='right'))]
+
+        char_widths = self._get_char_widths(font)
+        cumulative_widths = [0]
+        width = 0
+        for char in text:
+            char_width = char_widths.get(char)
+            if char_width is None:
+                char_width = char_widths[char] = font.getlength(char)
+            width += char_width
+            cumulative_widths.append(width)
+        cut = bisect.bisect_right(cumulative_widths, max_width) - 1
+        return text[:max(0, cut)]
+
+    def _get_ascii_widths(self, font):
+        """Returns a NumPy table with the width of each of the 128 ASCII characters for a font."""
+        ascii_widths = self._ascii_width_cache.get(font)
+        if ascii_widths is None:
+            ascii_widths = np.fromiter((font.getlength(chr(c)) for c in range(128)), dtype=np.float32, count=128)
+            self._ascii_width_cache[font] = ascii_widths
+        return ascii_widths
+
+    def _get_char_widths(self, font):
+        """Returns the per-character width cache for a font, shared by every image of this generator."""
+        char_widths = self._char_width_cache.get(font)
+        if char_widths is None:
+            char_widths = self._char_width_cache[font] = {}
+        return char_widths
+
+    def _get_word_widths(self, font):
+        """Returns the per-word width cache for a font, shared by every image of this generator."""
+        word_widths = self._word_width_cache.get(font)
+        if word_widths is None:
+            word_widths = self._word_width_cache[font] = {}
+        return word_widths
+
+    def _blit_multiline(self, draw, lines, pos, font, fill, line_spacing=10):
+        """Draws already wrapped lines starting at pos and returns the y position after the last line."""
+        if lines:
+            # multiline_text advances by the height of "A" plus spacing; pick spacing so that each
+            # line still advances by font.size + line_spacing as with per-line drawing
+            a_height = self._a_height_cache.get(font)
+            if a_height is None:
+                a_height = self._a_height_cache[font] = self._get_measure_draw().textbbox((0, 0), "A", font=font)[3]
+            spacing = font.size + line_spacing - a_height
+            draw.multiline_text(pos, '\n'.join(lines), font=font, fill=fill, spacing=spacing)
+        return pos[1] + len(lines) * (font.size + line_spacing)
+
+    def _get_canvas(self, post: Dict) -> Image.Image:
+        """Returns this thread's canvas reset to the post's base frame, instead of allocating a new frame."""
+        base_frame = self._get_bands(post)[2]
+        canvas = getattr(self._canvas_local, 'canvas', None)
+        if canvas is None or canvas.size != base_frame.size:
+            canvas = base_frame.copy()
+            self._canvas_local.canvas = canvas
+        else:
+            canvas.paste(base_frame, (0, 0))
+        return canvas
+
+    def _get_measure_draw(self) -> ImageDraw.ImageDraw:
+        """Returns this thread's scratch draw context used only for text measurement."""
+        measure_draw = getattr(self._canvas_local, 'measure_draw', None)
+        if measure_draw is None:
+            # textbbox does not modify the image, so a 1x1 image is enough
+            measure_draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+            self._canvas_local.measure_draw = measure_draw
+        return measure_draw
+
+    def _get_bands(self, post: Dict):
+        """
+        Returns the (header, info bar, base frame) images for a post.
+
+        Both bands are identical for every frame of a post, so they are rendered once and pasted.
+        The base frame is the white background with both bands already in place.
+        Only the images of the current post are kept. They are keyed by every field the bands draw, since the
+        same post id can come back from a later collection with a new score or comment count.
+        """
+        band_key = (post.get('id'), post.get('subreddit_name', ''), post.get('author', ''), post.get('created_utc', ''),
+                    post.get('score', 0), post.get('num_comments', 0))
+        bands = self._band_cache.get(band_key)
+        if bands is None:
+            # Rectangles in the frame were drawn inclusive of the bottom edge, hence the extra row
+            header_band = Image.new("RGB", (self.width, self._header_height + 1), COLOR_CYAN)
+            self._draw_header(ImageDraw.Draw(header_band), post, self._padding, self._header_height)
+            info_bar_band = Image.new("RGB", (self.width, self._info_bar_height + 1), COLOR_CYAN)
+            self._draw_info_bar(ImageDraw.Draw(info_bar_band), post, self._padding, 0, self._info_bar_height)
+            base_frame = Image.new("RGB", (self.width, self.height), COLOR_WHITE)
+            base_frame.paste(header_band, (0, 0))
+            base_frame.paste(info_bar_band, (0, self._info_bar_y))
+            bands = (header_band, info_bar_band, base_frame)
+            self._band_cache = {band_key: bands}
+        return bands
+
+    def _post_has_image(self, post: Dict) -> bool:
+        """Returns whether the post has an image, stashing the answer on the post dict for its other frames."""
+        has_image = post.get('_has_image')
+        if has_image is None:
+            try:
+                has_image = self._find_image_url(post) is not None
+            except Exception as e:
+                # Log error but assume no image is available for safety
+                logger.error(f"Error checking for image URL for post {post.get('id', 'unknown')}: {e}")
+                has_image = False
+            post['_has_image'] = has_image
+        return has_image
+
+    @staticmethod
+    def _post_has_body(post: Dict) -> bool:
+        """Returns whether the post has a non-empty selftext, stashing the answer on the post dict."""
+        has_body = post.get('_has_body')
+        if has_body is None:
+            has_body = post['_has_body'] = post.get('selftext', '').strip() != ''
+        return has_body
 
     def _draw_header(self, draw, post: Dict, padding: int, header_height: int):
         """Draws the header section (subreddit, author, date)"""
         font_top = self._get_font(36)
         draw.text((padding, padding), f"r/{post.get('subreddit_name', '')}", fill=COLOR_WHITE, font=font_top)
         author_text = f"by {post.get('author', '')}"
-        # Need a dummy draw context or calculate width manually for textbbox without drawing
-        # A simple way is to use the same font and a temporary image/draw
-        temp_img = Image.new('RGB', (1, 1))
-        temp_draw = ImageDraw.Draw(temp_img)
-        author_bbox = temp_draw.textbbox((0,0), author_text, font=font_top)
+        author_bbox = self._get_measure_draw().textbbox((0,0), author_text, font=font_top)
         author_width = author_bbox[2] - author_bbox[0]
         draw.text((self.width - author_width - padding, padding), author_text, fill=COLOR_WHITE, font=font_top)
 
@@ -155,14 +471,24 @@ class ContentImageGenerator:
         font_info = self._get_font(32)
         upvotes = post.get('score', 0)
         comments_count = post.get('num_comments', 0)
-        draw.text((padding, info_bar_y + padding//2), f"▲ {upvotes}", fill=COLOR_RED, font=font_info)
-        draw.text((padding + 160, info_bar_y + padding//2), f"💬 {comments_count}", fill=COLOR_WHITE, font=font_info)
+        text_y = info_bar_y + self._half_padding
+        draw.text((padding, text_y), f"▲ {upvotes}", fill=COLOR_RED, font=font_info)
+        draw.text((padding + 160, text_y), f"💬 {comments_count}", fill=COLOR_WHITE, font=font_info)
 
     def _find_image_url(self, post: Dict) -> str | None:
         """Attempts to find a suitable image URL in the post data."""
+        post_id = post.get('id')
+        if post_id and post_id in self._image_url_cache:
+            return self._image_url_cache[post_id]
+        image_url = self._lookup_image_url(post)
+        if post_id:
+            self._image_url_cache[post_id] = image_url
+        return image_url
+
+    def _lookup_image_url(self, post: Dict) -> str | None:
         # Prioritize url_overridden_by_dest if it exists and looks like an image
         url_dest = post.get('url_overridden_by_dest')
-        if url_dest and isinstance(url_dest, str) and any(url_dest.lower().endswith(ext) for ext in ['.jpg', '.png', '.gif', '.jpeg']):
+        if url_dest and isinstance(url_dest, str) and _IMG_URL_RE.search(url_dest):
             return url_dest
 
         # Check preview images
@@ -179,41 +505,55 @@ class ContentImageGenerator:
 
         # Fallback to the main URL if it looks like an image URL (less reliable)
         url = post.get('url')
-        if url and isinstance(url, str) and any(url.lower().endswith(ext) for ext in ['.jpg', '.png', '.gif', '.jpeg']):
+        if url and isinstance(url, str) and _IMG_URL_RE.search(url):
             return url
 
         # Add logging if no image URL is found
-        try:
-            from loguru import logger
-            logger.debug(f"No suitable image URL found for post {post.get('id', 'unknown')}")
-        except ImportError:
-            print(f"Debug: No suitable image URL found for post {post.get('id', 'unknown')}")
+        logger.debug(f"No suitable image URL found for post {post.get('id', 'unknown')}")
 
         return None
 
     def _download_image(self, url: str) -> Image.Image | None:
         """Downloads an image from a URL and returns a Pillow Image object."""
+        with self._image_cache_lock:
+            cached = self._image_cache.get(url)
+            if cached is not None:
+                self._image_cache.move_to_end(url)
+        if cached is not None:
+            return cached.copy() # Callers may modify the image, keep the cached one intact
         try:
-            import requests
-            response = requests.get(url, stream=True)
+            session = self._get_session()
+            response = session.get(url, timeout=10)
             response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
-            img = Image.open(response.raw)
-            return img
+            # Read the whole body first so the connection goes back to the pool before decoding
+            img = Image.open(io.BytesIO(response.content))
+            # Let libjpeg decode large JPEGs at a reduced scale (1/2..1/8) that still covers the
+            # largest size the image is ever resized to; no-op for other formats
+            img.draft('RGB', (self._content_width, _MAX_MEDIA_HEIGHT))
+            img.load() # Decode now so later resize/paste calls do not re-read the buffer
+            with self._image_cache_lock:
+                self._image_cache[url] = img
+                if len(self._image_cache) > _IMAGE_CACHE_SIZE:
+                    self._image_cache.popitem(last=False)
+            return img.copy()
         except ImportError:
-            try:
-                from loguru import logger
-                logger.error("Requests library not found. Cannot download images.")
-            except ImportError:
-                print("Error: Requests library not found. Cannot download images.")
+            logger.error("Requests library not found. Cannot download images.")
             return None
         except Exception as e:
-            try:
-                from loguru import logger
-                logger.error(f"Error downloading image from {url}: {e}")
-            except ImportError:
-                print(f"Error: Error downloading image from {url}: {e}")
+            logger.error(f"Error downloading image from {url}: {e}")
             return None
 
+    def _get_session(self):
+        """Returns a pooled requests.Session, reused so connections are kept alive across downloads."""
+        if self._session is None:
+            import requests
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session = session
+        return self._session
+
     def _resize_image(self, image: Image.Image, max_width: int, max_height: int) -> Image.Image:
         """Resizes an image to fit within max_width and max_height while maintaining aspect ratio."""
         img_width, img_height = image.size
@@ -238,8 +578,9 @@ class ContentImageGenerator:
             new_width = max(1, int(new_width))
             new_height = max(1, int(new_height))
 
-            # Use LANCZOS for high-quality downsampling
-            resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            # Use LANCZOS for high-quality downsampling. For large downscales reducing_gap first shrinks
+            # the image with the fast box reduce() to ~3x the target, so LANCZOS runs on far fewer pixels.
+            resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
             return resized_image
         else:
             # Image is already smaller than max dimensions, return as is
@@ -250,42 +591,41 @@ class ContentImageGenerator:
         """
         Removes URLs from a given text string.
         """
-        # Simple regex to find URLs starting with http or https or www.
-        # This might not catch all URLs, but covers most common cases.
-        # Updated regex to be a bit more comprehensive for common URL patterns
-        url_pattern = re.compile(r'\b(?:https?://|www\.)\S+|\b[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?:/[^\s]*)?\b')
-        return url_pattern.sub('', text).strip() # Also strip whitespace left by removed URL
+        # Only URLs starting with http(s):// or www. are removed; bare domains are left alone
+        # because that pattern also matched abbreviations like "U.S." or "e.g." and backtracked heavily.
+        return _URL_RE.sub('', text).strip() if text else '' # Also strip whitespace left by removed URL
+
+    def get_cleaned_text(self, data: Dict, key: str) -> str:
+        """
+        Returns data[key] with URLs removed, stashing the result on the dict so later passes reuse it.
+        Public so callers such as the video pipeline's TTS step get the exact text drawn by post_to_images
+        without cleaning it a second time.
+        """
+        cache_key = f"_cleaned_{key}"
+        cleaned = data.get(cache_key)
+        if cleaned is None:
+            cleaned = data[cache_key] = self._remove_urls(data.get(key, ''))
+        return cleaned
 
     def generate_post_only_image(self, post: Dict, idx=0, text_content="", image_type="", image_name_suffix=""):
         """Generate image with post title and body only."""
-        img = Image.new("RGB", (self.width, self.height), COLOR_WHITE)
+        img = self._get_canvas(post)
         draw = ImageDraw.Draw(img)
 
-        padding = 30
-        header_height = 100
-        info_bar_height = 100
-        footer_space = 50
+        padding = self._padding
+        header_height = self._header_height
+        info_bar_height = self._info_bar_height
+        info_bar_y = self._info_bar_y
 
-        # 상단 바
-        draw.rectangle([0, 0, self.width, header_height], fill=COLOR_CYAN)
-        self._draw_header(draw, post, padding, header_height)
+        # 상단 바/하단 정보 바는 게시물별 기본 프레임에 이미 그려져 있음
+        info_bar_band = self._get_bands(post)[1]
 
         # 제목
         title_start_y = header_height + padding
         # Determine title font size based on content
         has_body = text_content != ''
-        # Safely determine if an image is available
-        has_image = False
-        try:
-            image_url = self._find_image_url(post)
-            has_image = image_url is not None
-        except Exception as e:
-            # Log error but assume no image is available for safety
-            try:
-                from loguru import logger
-                logger.error(f"Error checking for image URL for post {post.get('id', 'unknown')}: {e}")
-            except ImportError:
-                print(f"Error: Error checking for image URL for post {post.get('id', 'unknown')}: {e}")
+        # Safely determine if an image is available (checked once per post)
+        has_image = self._post_has_image(post)
 
         if has_body or has_image:
             font_title_size = 38
@@ -293,7 +633,7 @@ class ContentImageGenerator:
             font_title_size = 48
         
         font_title = self._get_font(font_title_size)
-        title_max_width = self.width - 2 * padding
+        title_max_width = self._content_width
         current_y = self._draw_multiline(draw, text_content, (padding, title_start_y), font_title, COLOR_BLACK, title_max_width, max_lines=None, line_spacing=15)
         current_y += padding # Add space below title
 
@@ -303,7 +643,6 @@ class ContentImageGenerator:
             post_image = self._download_image(image_url)
             if post_image:
                 # Calculate max area for image (below title, above potential body/info bar)
-                info_bar_y = self.height - footer_space - info_bar_height
                 # Available vertical space for image and body combined
                 available_space_for_media_body = info_bar_y - current_y - padding # Add padding above info bar
                 
@@ -318,12 +657,12 @@ class ContentImageGenerator:
                 # Condition to increase image size: taller image AND body is short or empty
                 if aspect_ratio <= 1 and is_body_short_or_empty:
                     # Allow a larger max height
-                    max_image_height = min(600, int(available_space_for_media_body * 0.8)) # Example values
+                    max_image_height = min(_MAX_MEDIA_HEIGHT, int(available_space_for_media_body * 0.8)) # Example values
                 else:
                     # Use default max height otherwise
                     max_image_height = min(400, int(available_space_for_media_body * 0.6))
 
-                max_image_width = self.width - 2 * padding
+                max_image_width = self._content_width
 
                 if max_image_height > 50: # Ensure there's meaningful space for an image
                     try:
@@ -344,28 +683,19 @@ class ContentImageGenerator:
                         
                     except Exception as e:
                         # Log image processing error but continue
-                        try:
-                            from loguru import logger
-                            logger.error(f"Error processing image for post {post.get('id', 'unknown')}: {e}")
-                        except ImportError:
-                            print(f"Error: Error processing image for post {post.get('id', 'unknown')}: {e}")
+                        logger.error(f"Error processing image for post {post.get('id', 'unknown')}: {e}")
                 else:
                     # Log if not enough space for image
-                    try:
-                        from loguru import logger
-                        logger.debug(f"Not enough vertical space ({max_image_height}px) for image in post {post.get('id', 'unknown')}")
-                    except ImportError:
-                        print(f"Debug: Not enough vertical space ({max_image_height}px) for image in post {post.get('id', 'unknown')}")
+                    logger.debug(f"Not enough vertical space ({max_image_height}px) for image in post {post.get('id', 'unknown')}")
 
         # Draw Body
         body = post.get('selftext', '').strip()
         if body:
             font_body = self._get_font(31)
-            body_max_width = self.width - 2 * padding
+            body_max_width = self._content_width
 
             # Calculate available space for body before info bar
-            info_bar_y = self.height - footer_space - info_bar_height
-            max_body_end_y = info_bar_y - padding # Max Y for body to end, leaving padding space
+            max_body_end_y = self._content_bottom_y # Max Y for body to end, leaving padding space
             available_height_for_body = max_body_end_y - current_y
 
             body_max_lines = int(available_height_for_body / (font_body.size + 10)) if (available_height_for_body) > 0 else 0
@@ -374,47 +704,34 @@ class ContentImageGenerator:
             current_y = self._draw_multiline(draw, body, (padding, current_y), font_body, COLOR_BLACK, body_max_width, max_lines=body_max_lines, line_spacing=10)
             current_y += padding # Add space below body
 
-        # 하단 정보 (업보트/댓글 수) - 위치 고정
-        info_bar_y = self.height - footer_space - info_bar_height
-        draw.rectangle([0, info_bar_y, self.width, info_bar_y + info_bar_height], fill=COLOR_CYAN)
-        self._draw_info_bar(draw, post, padding, info_bar_y, info_bar_height)
+        # 하단 정보 (업보트/댓글 수) - 위치 고정, 넘친 내용을 덮도록 마지막에 다시 붙여넣음
+        img.paste(info_bar_band, (0, info_bar_y))
 
         # Save
-        filename = f"post_{idx}_{post.get('id', 'unknown')}.png"
+        filename = f"post_{idx}_{post.get('id', 'unknown')}{IMAGE_EXT}"
         filepath = os.path.join(self.output_dir, filename)
-        img.save(filepath)
+        img.save(filepath, **_IMAGE_SAVE_OPTIONS)
         return filepath
 
     def generate_comment_image_part(self, post: Dict, comment: Dict, wrapped_comment_lines: List[str], start_line_index: int, post_idx: int, comment_idx: int, part_idx: int) -> (str, int):
         """Generate an image for a part of a long comment."""
-        img = Image.new("RGB", (self.width, self.height), COLOR_WHITE)
+        img = self._get_canvas(post)
         draw = ImageDraw.Draw(img)
 
-        padding = 30
-        header_height = 100
-        info_bar_height = 100
-        footer_space = 50
+        padding = self._padding
+        header_height = self._header_height
+        info_bar_height = self._info_bar_height
+        info_bar_y = self._info_bar_y
 
-        # 상단 바
-        draw.rectangle([0, 0, self.width, header_height], fill=COLOR_CYAN)
-        self._draw_header(draw, post, padding, header_height)
+        # 상단 바/하단 정보 바는 게시물별 기본 프레임에 이미 그려져 있음
+        info_bar_band = self._get_bands(post)[1]
 
         # 제목
         title_start_y = header_height + padding
         # Determine title font size based on post content (same logic as post-only image)
-        has_body = post.get('selftext', '').strip() != ''
-        # Safely determine if an image is available
-        has_image = False
-        try:
-            image_url = self._find_image_url(post)
-            has_image = image_url is not None
-        except Exception as e:
-            # Log error but assume no image is available for safety
-            try:
-                from loguru import logger
-                logger.error(f"Error checking for image URL for post {post.get('id', 'unknown')}: {e}")
-            except ImportError:
-                print(f"Error: Error checking for image URL for post {post.get('id', 'unknown')}: {e}")
+        has_body = self._post_has_body(post)
+        # Safely determine if an image is available (checked once per post)
+        has_image = self._post_has_image(post)
 
         if has_body or has_image:
             font_title_size = 38
@@ -422,34 +739,34 @@ class ContentImageGenerator:
             font_title_size = 48
         
         font_title = self._get_font(font_title_size)
-        title_max_width = self.width - 2 * padding
+        title_max_width = self._content_width
         current_y = self._draw_multiline(draw, post.get('title', ''), (padding, title_start_y), font_title, COLOR_BLACK, title_max_width, max_lines=None, line_spacing=15)
         current_y += padding # Add space below title
 
         # Draw Comment Part
         font_comment = self._get_font(36)
-        comment_max_width = self.width - 2 * padding
+        comment_max_width = self._content_width
 
         # Add image to comment part if available in comment data
         comment_image_url = None
         # Prioritize media_metadata if it exists and contains image info (e.g., gallery)
         comment_media_metadata = comment.get('media_metadata')
         if comment_media_metadata and isinstance(comment_media_metadata, dict):
-            # Find the first image ID in media_metadata (structure can be complex, simplify for common cases)
+            # Use the first image in media_metadata (e.g., gallery)
             image_id = next(iter(comment_media_metadata)) if comment_media_metadata else None
             if image_id:
-                # Construct a potential image URL from media_metadata (this structure varies!)
-                # A common pattern for Reddit-hosted images in media_metadata might involve a URL like:
-                # https://i.redd.it/{image_id}.jpg or .png
-                # This is a heuristic and might need refinement based on actual data structure.
-                # Let's try a common pattern:
-                comment_image_url = f'https://i.redd.it/{image_id}.jpg' # Assume jpg for now, could check metadata for type
-                # Further logic might be needed to check metadata['e']['m'] for mime type etc.
-                # For simplicity, just try the jpg/png extensions on i.redd.it
-                if not self._download_image(comment_image_url): # Try jpg
-                    comment_image_url = f'https://i.redd.it/{image_id}.png' # Try png
-                    if not self._download_image(comment_image_url): # Try png
-                        comment_image_url = None # Neither worked
+                meta = comment_media_metadata[image_id]
+                meta = meta if isinstance(meta, dict) else {}
+                # Prefer the full-size source URL Reddit provides, otherwise build the i.redd.it URL
+                # from the mime type ('m', e.g. image/jpg or image/png) instead of probing extensions
+                source = meta.get('s')
+                source_url = source.get('u') if isinstance(source, dict) else None
+                if source_url:
+                    comment_image_url = source_url.replace('&amp;', '&')
+                else:
+                    mime = meta.get('m') or 'image/jpg'
+                    ext = 'png' if 'png' in mime else ('gif' if 'gif' in mime else 'jpg')
+                    comment_image_url = f'https://i.redd.it/{image_id}.{ext}'
 
         # If media_metadata didn't yield an image, check the 'media' field
         if not comment_image_url:
@@ -477,13 +794,12 @@ class ContentImageGenerator:
         if comment_image:
              # Calculate max area for image within the comment section
              # Allocate some height for the image, leaving space for text
-             info_bar_y = self.height - footer_space - info_bar_height
-             max_comment_section_end_y = info_bar_y - padding
+             max_comment_section_end_y = self._content_bottom_y
              available_space_for_media_and_text = max_comment_section_end_y - current_y
 
              # Allocate a portion of space for the image, e.g., max 300px height or 40% of available space
              max_comment_image_height = min(300, int(available_space_for_media_and_text * 0.4))
-             max_comment_image_width = self.width - 2 * padding
+             max_comment_image_width = self._content_width
 
              if max_comment_image_height > 50: # Ensure meaningful space
                   try:
@@ -504,105 +820,113 @@ class ContentImageGenerator:
                      
                   except Exception as e:
                         # Log image processing error but continue
-                        try:
-                            from loguru import logger
-                            logger.error(f"Error processing comment image for post {post.get('id', 'unknown')}, comment {comment.get('id', 'unknown')}: {e}")
-                        except ImportError:
-                            print(f"Error: Error processing comment image for post {post.get('id', 'unknown')}, comment {comment.get('id', 'unknown')}: {e}")
+                        logger.error(f"Error processing comment image for post {post.get('id', 'unknown')}, comment {comment.get('id', 'unknown')}: {e}")
              else:
                   # Log if not enough space for image
-                  try:
-                      from loguru import logger
-                      logger.debug(f"Not enough vertical space ({max_comment_image_height}px) for comment image in post {post.get('id', 'unknown')}, comment {comment.get('id', 'unknown')}")
-                  except ImportError:
-                      print(f"Debug: Not enough vertical space ({max_comment_image_height}px) for comment image in post {post.get('id', 'unknown')}, comment {comment.get('id', 'unknown')}")
+                  logger.debug(f"Not enough vertical space ({max_comment_image_height}px) for comment image in post {post.get('id', 'unknown')}, comment {comment.get('id', 'unknown')}")
 
         # Comment background area calculations
         comment_draw_start_y = current_y # Start comment text/background from current_y (after image if any)
 
         # Available height for drawing comment lines
-        info_bar_y = self.height - footer_space - info_bar_height
-        max_comment_draw_end_y = info_bar_y - padding # Max Y before info bar
+        max_comment_draw_end_y = self._content_bottom_y # Max Y before info bar
         available_draw_height = max_comment_draw_end_y - comment_draw_start_y
 
-        text_start_y_in_bg = comment_draw_start_y + padding // 2
+        text_start_y_in_bg = comment_draw_start_y + self._half_padding
         available_text_height_in_bg = (max_comment_draw_end_y - (comment_draw_start_y)) - (padding) # Space for text within background
         available_text_height_in_bg = max(0, available_text_height_in_bg) # Ensure non-negative
         
-        # Determine which lines fit in this part
-        lines_drawn_count = 0
-        current_draw_y = text_start_y_in_bg
-        end_line_index = start_line_index # Initialize end index
-
-        for i in range(start_line_index, len(wrapped_comment_lines)):
-            line = wrapped_comment_lines[i]
-            line_height = font_comment.size + 8
-            if (current_draw_y - text_start_y_in_bg) + line_height <= available_text_height_in_bg:
-                # This line fits
-                current_draw_y += line_height
-                lines_drawn_count += 1
-                end_line_index = i + 1 # Next line index to start from
-            else:
-                break # This line does not fit, stop drawing
+        # Determine which lines fit in this part (every line has the same height)
+        line_spacing = 8
+        line_height = font_comment.size + line_spacing
+        lines_drawn_count = min(available_text_height_in_bg // line_height, len(wrapped_comment_lines) - start_line_index)
+        lines_drawn_count = max(0, lines_drawn_count)
+        end_line_index = start_line_index + lines_drawn_count # Next line index to start from
 
         # Draw the background based on how much text actually fits
-        comment_bg_end_y = text_start_y_in_bg + (lines_drawn_count * (font_comment.size + 8)) + padding // 2 # Background ends after drawn text + bottom padding
+        comment_bg_end_y = text_start_y_in_bg + (lines_drawn_count * line_height) + self._half_padding # Background ends after drawn text + bottom padding
         comment_bg_end_y = min(comment_bg_end_y, max_comment_draw_end_y) # Ensure background doesn't go past max allowed
-        comment_bg_end_y = max(comment_bg_end_y, comment_draw_start_y + padding + font_comment.size + 8) # Ensure min height
+        comment_bg_end_y = max(comment_bg_end_y, comment_draw_start_y + padding + line_height) # Ensure min height
 
         if comment_bg_end_y > comment_draw_start_y:
             draw.rectangle([0, comment_draw_start_y, self.width, comment_bg_end_y], fill=COLOR_CYAN)
 
-            # Redraw the lines that fit, now with the correct background
-            current_draw_y = text_start_y_in_bg
-            for i in range(start_line_index, start_line_index + lines_drawn_count):
-                line = wrapped_comment_lines[i]
-                draw.text((padding, current_draw_y), line, font=font_comment, fill=COLOR_WHITE)
-                current_draw_y += font_comment.size + 8
+            # Draw the lines that fit on top of the background in one call
+            self._blit_multiline(draw, wrapped_comment_lines[start_line_index:end_line_index], (padding, text_start_y_in_bg), font_comment, COLOR_WHITE, line_spacing)
 
-        # Add info bar at fixed bottom position
-        info_bar_y = self.height - footer_space - info_bar_height
-        draw.rectangle([0, info_bar_y, self.width, info_bar_y + info_bar_height], fill=COLOR_CYAN)
-        self._draw_info_bar(draw, post, padding, info_bar_y, info_bar_height)
+        # Add info bar at fixed bottom position (pasted again last so it covers any overflow)
+        img.paste(info_bar_band, (0, info_bar_y))
 
         # Save
-        filename = f"post_{post_idx}_comment_{comment_idx}_part_{part_idx}.png"
+        filename = f"post_{post_idx}_comment_{comment_idx}_part_{part_idx}{IMAGE_EXT}"
         filepath = os.path.join(self.output_dir, filename)
-        img.save(filepath)
+        img.save(filepath, **_IMAGE_SAVE_OPTIONS)
 
         # Return filepath and the index of the next line to draw (or len if done)
         return filepath, end_line_index
 
+    def generate_comment_parts_batch(self, post: Dict, comment: Dict, wrapped_comment_lines: List[str], post_idx: int, comment_idx: int) -> List[str]:
+        """
+        Generates all image parts of a long comment, rendering the parts concurrently.
+
+        Every part has the same layout (header, title, optional comment image), so the first part
+        tells how many lines fit per part and the remaining parts can be rendered independently.
+
+        Returns:
+            list[str]: Paths of the generated part images, in part order.
+        """
+        if not wrapped_comment_lines:
+            return []
+
+        first_filepath, lines_per_part = self.generate_comment_image_part(
+            post, comment, wrapped_comment_lines, 0, post_idx=post_idx, comment_idx=comment_idx, part_idx=1
+        )
+        filepaths = [first_filepath]
+        if lines_per_part <= 0:
+            # No line fits below the title/image, further parts would never make progress
+            logger.warning(f"No space for comment text in post {post.get('id', 'unknown')}, comment {comment.get('id', 'unknown')}. Skipping remaining parts.")
+            return filepaths
+
+        start_line_indices = range(lines_per_part, len(wrapped_comment_lines), lines_per_part)
+        executor = self._get_part_executor() if len(start_line_indices) > 1 else None
+        if executor is None:
+            filepaths.extend(
+                self.generate_comment_image_part(post, comment, wrapped_comment_lines, start_line_index,
+                                                 post_idx, comment_idx, part_idx)[0]
+                for part_idx, start_line_index in enumerate(start_line_indices, start=2)
+            )
+        else:
+            futures = [
+                executor.submit(
+                    self.generate_comment_image_part,
+                    post, comment, wrapped_comment_lines, start_line_index,
+                    post_idx, comment_idx, part_idx
+                )
+                for part_idx, start_line_index in enumerate(start_line_indices, start=2)
+            ]
+            filepaths.extend(future.result()[0] for future in futures)
+
+        return filepaths
+
     def generate_comment_image(self, post: Dict, comment: Dict, post_idx=0, comment_idx=0):
         """Generate image with post title and a single comment."""
-        img = Image.new("RGB", (self.width, self.height), COLOR_WHITE)
+        img = self._get_canvas(post)
         draw = ImageDraw.Draw(img)
 
-        padding = 30
-        header_height = 100
-        info_bar_height = 100 # Used for calculating available space
-        footer_space = 50 # Used for calculating available space
+        padding = self._padding
+        header_height = self._header_height
+        info_bar_height = self._info_bar_height
+        info_bar_y = self._info_bar_y
 
-        # 상단 바
-        draw.rectangle([0, 0, self.width, header_height], fill=COLOR_CYAN)
-        self._draw_header(draw, post, padding, header_height)
+        # 상단 바/하단 정보 바는 게시물별 기본 프레임에 이미 그려져 있음
+        info_bar_band = self._get_bands(post)[1]
 
         # 제목
         title_start_y = header_height + padding
         # Determine title font size based on post content (same logic as post-only image)
-        has_body = post.get('selftext', '').strip() != ''
-        # Safely determine if an image is available
-        has_image = False
-        try:
-            image_url = self._find_image_url(post)
-            has_image = image_url is not None
-        except Exception as e:
-            # Log error but assume no image is available for safety
-            try:
-                from loguru import logger
-                logger.error(f"Error checking for image URL for post {post.get('id', 'unknown')}: {e}")
-            except ImportError:
-                print(f"Error: Error checking for image URL for post {post.get('id', 'unknown')}: {e}")
+        has_body = self._post_has_body(post)
+        # Safely determine if an image is available (checked once per post)
+        has_image = self._post_has_image(post)
 
         if has_body or has_image:
             font_title_size = 38
@@ -610,7 +934,7 @@ class ContentImageGenerator:
             font_title_size = 48
         
         font_title = self._get_font(font_title_size)
-        title_max_width = self.width - 2 * padding
+        title_max_width = self._content_width
         current_y = self._draw_multiline(draw, post.get('title', ''), (padding, title_start_y), font_title, COLOR_BLACK, title_max_width, max_lines=None, line_spacing=15)
         current_y += padding # Add space below title
 
@@ -618,49 +942,31 @@ class ContentImageGenerator:
         # Format comment text with space after colon
         comment_text = f"{comment.get('author', '')}: {comment.get('body', '')}"
         font_comment = self._get_font(36) # Use body font size for comment for better readability
-        comment_max_width = self.width - 2 * padding
+        comment_max_width = self._content_width
 
         # Comment background area calculations
         comment_draw_start_y = current_y
 
         # Calculate required height for the full comment text
         wrapped_comment_lines = self._wrap_text(comment_text, font_comment, comment_max_width)
-        required_comment_height = len(wrapped_comment_lines) * (font_comment.size + 8)
+        line_height = font_comment.size + 8
+        required_comment_height = len(wrapped_comment_lines) * line_height
 
         # Comment background area ending Y position (required or max allowed)
-        info_bar_y = self.height - footer_space - info_bar_height # Position of info bar (conceptual for space calculation)
-        max_allowed_comment_bg_end_y = self.height - footer_space - info_bar_height - padding # Max Y before footer/info bar
+        max_allowed_comment_bg_end_y = self._content_bottom_y # Max Y before footer/info bar
         comment_preview_bg_end_y = min(comment_draw_start_y + required_comment_height + padding, max_allowed_comment_bg_end_y)
-        comment_preview_bg_end_y = max(comment_preview_bg_end_y, comment_draw_start_y + padding + font_comment.size + 8) # Ensure min height
+        comment_preview_bg_end_y = max(comment_preview_bg_end_y, comment_draw_start_y + padding + line_height) # Ensure min height
 
         if comment_preview_bg_end_y > comment_draw_start_y:
              draw.rectangle([0, comment_draw_start_y, self.width, comment_preview_bg_end_y], fill=COLOR_CYAN)
 
              # Draw comment text line by line to handle potential overflow
-             text_start_y = comment_draw_start_y + padding // 2
-             available_text_height = (comment_preview_bg_end_y - (comment_draw_start_y + padding // 2)) - (padding // 2) # Space for text, account for top/bottom padding
-             
-             lines_to_draw_indices = []
-             current_text_height = 0
+             text_start_y = comment_draw_start_y + self._half_padding
+             available_text_height = (comment_preview_bg_end_y - text_start_y) - self._half_padding # Space for text, account for top/bottom padding
              
-             # Determine how many lines fit in the current image
-             fitting_lines_count = 0
-             for i, line in enumerate(wrapped_comment_lines):
-                 line_height = font_comment.size + 8
-                 if current_text_height + line_height <= available_text_height:
-                     lines_to_draw_indices.append(i)
-                     current_text_height += line_height
-                     fitting_lines_count += 1
-                 else:
-                     break # Stop if the next line doesn't fit
-
-             drawn_lines_count = 0
-             current_draw_y = text_start_y
-             for i in lines_to_draw_indices:
-                 line = wrapped_comment_lines[i]
-                 draw.text((padding, current_draw_y), line, font=font_comment, fill=COLOR_WHITE)
-                 current_draw_y += font_comment.size + 8
-                 drawn_lines_count += 1
+             # Determine how many lines fit in the current image and draw them in one call
+             fitting_lines_count = min(len(wrapped_comment_lines), max(0, available_text_height // line_height))
+             self._blit_multiline(draw, wrapped_comment_lines[:fitting_lines_count], (padding, text_start_y), font_comment, COLOR_WHITE, line_spacing=8)
 
              # If there are remaining lines, generate additional images
              if fitting_lines_count < len(wrapped_comment_lines):
@@ -674,15 +980,13 @@ class ContentImageGenerator:
                  pass # Placeholder - actual multi-part logic needs more structure
 
         # Add info bar at fixed bottom position (optional for comment images?)
-        # Decided to include info bar for consistency.
-        info_bar_y = self.height - footer_space - info_bar_height
-        draw.rectangle([0, info_bar_y, self.width, info_bar_y + info_bar_height], fill=COLOR_CYAN)
-        self._draw_info_bar(draw, post, padding, info_bar_y, info_bar_height)
+        # Decided to include info bar for consistency. Pasted again last so it covers any overflow.
+        img.paste(info_bar_band, (0, info_bar_y))
 
         # Save
-        filename = f"post_{post_idx}_comment_{comment_idx}_{comment.get('id', 'unknown')}.png"
+        filename = f"post_{post_idx}_comment_{comment_idx}_{comment.get('id', 'unknown')}{IMAGE_EXT}"
         filepath = os.path.join(self.output_dir, filename)
-        img.save(filepath)
+        img.save(filepath, **_IMAGE_SAVE_OPTIONS)
         return filepath
 
     def generate_from_json(self, json_path: str):
@@ -698,49 +1002,16 @@ class ContentImageGenerator:
         """
         all_image_paths = []
         try:
-            with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            # Check if data is a list of posts or a dictionary containing posts
-            if isinstance(data, list):
-                posts = data
-            elif isinstance(data, dict) and "posts" in data and isinstance(data["posts"], list):
-                posts = data["posts"]
-            else:
-                print(f"Unexpected data format in {json_path}. Expected a list or a dictionary with a 'posts' key containing a list.")
-                return []
-
-            print(f"Generating images from {json_path}...")
-            for index, post_data in enumerate(posts):
-                self.current_post_index = index # Set current post index for filename consistency
-                
-                # --- Text Processing for TTS (Apply URL Removal here) ---
-                # Extract text for TTS from title, body, and comments
-                text_for_tts = post_data.get("title", "") + "\n\n" + post_data.get("body", "")
-                for comment in post_data.get("comments", []):
-                    # Apply URL removal and add comment author and body to TTS text
-                    comment_author = comment.get('author', '') or '[Deleted]'
-                    comment_body = comment.get('body', '') or ''
-                    cleaned_comment_body = self._remove_urls(comment_body) # Apply URL removal for TTS text
-                    if cleaned_comment_body:
-                         text_for_tts += f"\n\n{comment_author}: {cleaned_comment_body}"
-
-                # Clean the entire text for TTS by removing all URLs
-                cleaned_text_for_tts = self._remove_urls(text_for_tts)
-                
-                # Now, pass cleaned_text_for_tts to your TTS module
-                # Example (conceptual): save to a file that your TTS module reads
-                # tts_output_dir = "output/audio_text"
-                # os.makedirs(tts_output_dir, exist_ok=True)
-                # post_id = post_data.get('id', f'unknown_{index}')
-                # tts_text_filepath = os.path.join(tts_output_dir, f'{post_id}_tts_text.txt')
-                # with open(tts_text_filepath, 'w', encoding='utf-8') as f:
-                #     f.write(cleaned_text_for_tts)
-                # print(f"Saved TTS text for post {post_id} to {tts_text_filepath}")
-                # --- End Text Processing for TTS ---
-
-                post_images = self.post_to_images(post_data)
-                all_image_paths.extend(post_images)
+            # The file stays open while rendering, posts are parsed one at a time as workers need them
+            with open(json_path, "rb") as f:
+                posts = self.iter_posts(f)
+                if posts is None:
+                    print(f"Unexpected data format in {json_path}. Expected a list or a dictionary with a 'posts' key containing a list.")
+                    return []
+
+                print(f"Generating images from {json_path}...")
+                # Posts share no state, so they are rendered in parallel by worker processes
+                all_image_paths = self._render_posts(enumerate(posts))
             print(f"Finished image generation from {json_path}.")
 
         except Exception as e:
@@ -748,6 +1019,161 @@ class ContentImageGenerator:
 
         return all_image_paths
 
+    @staticmethod
+    def iter_posts(f):
+        """
+        Returns an iterable over the posts of an open (binary) JSON file holding either a list of posts
+        or a dictionary with a 'posts' list, or None if the file has neither shape.
+        """
+        if ijson is None:
+            data = _load_json_mapped(f) if orjson is not None else json.load(f)
+            # Check if data is a list of posts or a dictionary containing posts
+            if isinstance(data, list):
+                return data
+            if isinstance(data, dict) and isinstance(data.get("posts"), list):
+                return data["posts"]
+            return None
+
+        # Skip a UTF-8 BOM (ijson rejects it), then peek at the first non-whitespace byte to pick the item prefix
+        start = 3 if f.read(3) == b"\xef\xbb\xbf" else 0
+        f.seek(start)
+        head = f.read(64).lstrip()
+        while not head:
+            chunk = f.read(64)
+            if not chunk:
+                break
+            head = chunk.lstrip()
+        f.seek(start)
+        if head.startswith(b"["):
+            return ijson.items(f, "item", use_float=True)
+        if not head.startswith(b"{"):
+            return None
+        # Only stream a dictionary once its 'posts' value is known to be a list; scanning stops at that array
+        for prefix, event, _ in ijson.parse(f, use_float=True):
+            if prefix == "posts":
+                if event != "start_array":
+                    return None
+                break
+            if prefix == "" and event == "end_map":
+                return None
+        else:
+            return None
+        f.seek(start)
+        return ijson.items(f, "posts.item", use_float=True)
+
+    def _render_posts(self, jobs) -> List[str]:
+        """Renders (index, post_data) jobs across worker processes and returns the image paths in post order."""
+        pool = self._get_pool()
+        if pool is None:
+            image_paths = []
+            for index, post_data in jobs:
+                self.current_post_index = index # Set current post index for filename consistency
+                image_paths.extend(self.post_to_images(post_data))
+            return image_paths
+
+        # imap (not imap_unordered) keeps the returned paths in post order. Settings that can change
+        # between files travel with every job, so the long-lived workers always follow the parent
+        settings = (self.output_dir, self.min_comment_score, self.use_disk_cache, self.cache_dir)
+        worker_jobs = ((index, post_data, settings) for index, post_data in jobs)
+        return list(itertools.chain.from_iterable(pool.imap(_render_one_post, worker_jobs)))
+
+    def _get_pool(self):
+        """
+        Returns the worker pool, created on first use and kept for later JSON files so the
+        workers' font/wrap/image caches stay warm. Returns None on a single-core machine.
+        The pool lives until close() (or the end of a with block); if neither happens, the workers are
+        terminated when the generator is garbage collected or the interpreter exits.
+        """
+        if self._pool is None:
+            processes = os.cpu_count() or 1
+            if processes == 1:
+                return None
+            self._pool = multiprocessing.Pool(processes=processes, initializer=_init_render_worker,
+                                              initargs=(self.width, self.height, self.font_path, self.output_dir))
+            self._pool_finalizer = weakref.finalize(self, self._pool.terminate)
+        return self._pool
+
+    def set_output_dir(self, output_dir: str):
+        """Points the generator (and its worker processes) at a new output directory, keeping all caches."""
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _get_part_executor(self):
+        """
+        Returns the thread pool that renders comment parts, created once and kept for every post so its threads
+        (and their reusable canvases) persist. Returns None inside a worker process: posts are already rendered
+        in parallel there, one process per core, and more threads would only oversubscribe the CPU.
+        """
+        if multiprocessing.parent_process() is not None:
+            return None
+        if self._part_executor is None:
+            self._part_executor = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+        return self._part_executor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Shuts down the worker pool and the comment part thread pool, if they were started."""
+        if self._pool is not None:
+            self._pool_finalizer.detach()
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._part_executor is not None:
+            self._part_executor.shutdown()
+            self._part_executor = None
+
+    def _get_cache_dir(self) -> str:
+        """Returns the on-disk frame cache directory (<output_dir>/.cache unless set explicitly)."""
+        return self.cache_dir or os.path.join(self.output_dir, '.cache')
+
+    def _post_cache_key(self, post_data: Dict) -> str:
+        """
+        Returns a content hash of everything that decides a post's frames: the post data (without the
+        _-prefixed values stashed during rendering), its index in the filenames, the layout and the encoder,
+        salted with the frame cache version and whether the Numba wrap path is active.
+        """
+        post_fields = {key: value for key, value in post_data.items() if not key.startswith('_')}
+        post_fields['comments'] = [
+            {key: value for key, value in comment.items() if not key.startswith('_')} if isinstance(comment, dict) else comment
+            for comment in post_data.get('comments', [])
+        ]
+        key_source = json.dumps(
+            [_FRAME_CACHE_VERSION, _wrap_ascii_kernel_jit is not None, post_fields, self.current_post_index, self.width, self.height, self.font_path,
+             self.min_comment_score, IMAGE_EXT, _IMAGE_SAVE_OPTIONS],
+            sort_keys=True, ensure_ascii=False, default=str,
+        )
+        return hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+
+    def _load_cached_post(self, cache_key: str) -> List[str] | None:
+        """Copies a post's cached frames into output_dir and returns their paths, or None on a cache miss."""
+        entry_dir = os.path.join(self._get_cache_dir(), cache_key)
+        try:
+            with open(os.path.join(entry_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+                filenames = json.load(f)
+            for filename in dict.fromkeys(filenames):
+                shutil.copyfile(os.path.join(entry_dir, filename), os.path.join(self.output_dir, filename))
+        except (OSError, ValueError):
+            return None
+        return [os.path.join(self.output_dir, filename) for filename in filenames]
+
+    def _store_cached_post(self, cache_key: str, image_paths: List[str]):
+        """Stores a post's rendered frames under its cache key; the manifest is written last, so partial entries are misses."""
+        entry_dir = os.path.join(self._get_cache_dir(), cache_key)
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            filenames = [os.path.basename(path) for path in image_paths]
+            for path in dict.fromkeys(image_paths):
+                shutil.copyfile(path, os.path.join(entry_dir, os.path.basename(path)))
+            with open(os.path.join(entry_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json.dump(filenames, f)
+        except OSError as e:
+            logger.warning(f"Could not write frame cache entry {cache_key}: {e}")
+
     def post_to_images(self, post_data):
         """
         Generates a sequence of images for a given Reddit post.
@@ -759,17 +1185,23 @@ class ContentImageGenerator:
             list[str]: List of paths to the generated image files.
         """
         post_id = post_data.get("id", "")
-        post_title = post_data.get("title", "N/A")
-        post_body = post_data.get("body", "")
         comments = post_data.get("comments", [])
 
         if not post_id:
             print("Warning: Post data missing ID. Skipping image generation for this post.")
             return []
 
+        # 같은 게시물을 같은 설정으로 이미 렌더링했다면 디스크 캐시에서 복사
+        cache_key = self._post_cache_key(post_data) if self.use_disk_cache else None
+        if cache_key is not None:
+            cached_paths = self._load_cached_post(cache_key)
+            if cached_paths is not None:
+                logger.info(f"Reused {len(cached_paths)} cached images for post {post_id}")
+                return cached_paths
+
         # Clean up the title and body text - Add URL removal here
-        cleaned_title = self._remove_urls(post_title)
-        cleaned_body = self._remove_urls(post_body)
+        cleaned_title = self.get_cleaned_text(post_data, "title") if "title" in post_data else "N/A"
+        cleaned_body = self.get_cleaned_text(post_data, "body")
 
         # --- Image 1: Title ---
         # Use cleaned_title for image generation
@@ -798,9 +1230,17 @@ class ContentImageGenerator:
 
         # --- Images 3+: Comments ---
         # Use the cleaned comment text - Add URL removal here for comments
+        font_comment = self._get_font(36)
+        comment_max_width = self._content_width
         for i, comment in enumerate(comments):
-            comment_text_raw = comment.get("body", "")
-            cleaned_comment_text = self._remove_urls(comment_text_raw) # Apply URL removal to comment text
+            # Cheap checks first, so low-score and blank comments skip URL removal and wrapping
+            if self.min_comment_score is not None and (comment.get("score") or 0) < self.min_comment_score:
+                continue
+            if not (comment.get("body") or "").strip():
+                logger.debug(f"Skipping empty comment at index {i} for post {post_id}")
+                continue
+
+            cleaned_comment_text = self.get_cleaned_text(comment, "body") # Apply URL removal to comment text (reused if already cleaned)
             
             # Skip comments that are empty after URL removal
             if not cleaned_comment_text:
@@ -817,56 +1257,75 @@ class ContentImageGenerator:
             if formatted_comment_text:
                  # Again, a comment might be split into multiple images if long
                  # We will generate multiple images for long comments
-                 font_comment = self._get_font(36)
-                 padding = 30 # Ensure padding is defined
-                 comment_max_width = self.width - 2 * padding
-
                  wrapped_comment_lines = self._wrap_text(formatted_comment_text, font_comment, comment_max_width)
                  
                  if not wrapped_comment_lines:
                      print(f"Skipping comment {comment_id} for post {post_id} as it resulted in no wrapped lines.")
                      continue
 
-                 start_line_index = 0
-                 part_idx = 1
-                 while start_line_index < len(wrapped_comment_lines):
-                     # Generate images for parts of the comment
-                     filepath, next_start_line_index = self.generate_comment_image_part(
-                         post_data, # Pass post data for header
-                         comment, # Pass comment data
-                         wrapped_comment_lines, # Pass the pre-wrapped lines
-                         start_line_index,
-                         post_idx=self.current_post_index, # Use the stored post index
-                         comment_idx=i, # Use the comment index
-                         part_idx=part_idx
-                     )
+                 # Generate images for parts of the comment
+                 part_filepaths = self.generate_comment_parts_batch(
+                     post_data, # Pass post data for header
+                     comment, # Pass comment data
+                     wrapped_comment_lines, # Pass the pre-wrapped lines
+                     post_idx=self.current_post_index, # Use the stored post index
+                     comment_idx=i # Use the comment index
+                 )
+                 for part_idx, filepath in enumerate(part_filepaths, start=1):
                      if filepath: image_paths.append(filepath)
-                     try:
-                        from loguru import logger
-                        logger.info(f"Generated comment image part {part_idx} for comment {comment_id} on post {post_id}: {filepath}")
-                     except ImportError:
-                        print(f"Generated comment image part {part_idx} for comment {comment_id} on post {post_id}: {filepath}")
-
-                     start_line_index = next_start_line_index
-                     part_idx += 1
+                     logger.info(f"Generated comment image part {part_idx} for comment {comment_id} on post {post_id}: {filepath}")
 
         # Ensure images are sorted correctly (though filename should help)
         # The video generator handles the final sorting based on name
-        
+        if cache_key is not None:
+            self._store_cached_post(cache_key, image_paths)
+
         return image_paths
 
+def _load_json_mapped(f):
+    """Parses an open binary file with orjson straight from a read-only memory map, without copying it into a bytes object first."""
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError, io.UnsupportedOperation):
+        # Empty files can't be mapped and in-memory streams have no fileno, read them normally
+        return orjson.loads(f.read().removeprefix(b"\xef\xbb\xbf"))
+    with mapped, memoryview(mapped) as buffer:
+        # orjson rejects a UTF-8 BOM, so parse past it
+        return orjson.loads(buffer[3:] if buffer[:3] == b"\xef\xbb\xbf" else buffer)
+
+
+# 워커 프로세스마다 하나씩 만들어 폰트/줄바꿈/이미지 캐시를 여러 게시물에 재사용
+_worker_generator = None
+
+
+def _init_render_worker(width, height, font_path, output_dir):
+    """Pool initializer: builds this worker process's ContentImageGenerator. Per-file settings arrive with each job."""
+    global _worker_generator
+    _worker_generator = ContentImageGenerator(width=width, height=height, font_path=font_path, output_dir=output_dir)
+
+
+def _render_one_post(job):
+    """Renders one (index, post_data, settings) job in a worker process and returns its image paths."""
+    index, post_data, (output_dir, min_comment_score, use_disk_cache, cache_dir) = job
+    if _worker_generator.output_dir != output_dir:
+        _worker_generator.set_output_dir(output_dir)
+    _worker_generator.min_comment_score = min_comment_score
+    _worker_generator.use_disk_cache = use_disk_cache
+    _worker_generator.cache_dir = cache_dir
+    _worker_generator.current_post_index = index
+    return _worker_generator.post_to_images(post_data)
+
+
 # Assuming you have a sample JSON file in the output directory for testing
 SAMPLE_JSON_PATH = 'output/AskReddit_20250514_093623.json' # Update this path as needed or create a sample file
 
 if __name__ == "__main__":
-    # Set up logging
-    try:
-        from loguru import logger
+    # Set up logging (file sink only with loguru)
+    if hasattr(logger, "add"):
         logger.add("logs/generator.log", rotation="1 MB")
-        logger.info("Content Image Generator script started.")
-    except ImportError:
+    else:
         print("Loguru not installed. Running without detailed logging.")
-        logger = None # Or a simple dummy logger
+    logger.info("Content Image Generator script started.")
 
     output_data_dir = 'output'
     output_images_base_dir = 'output/images'
@@ -876,40 +1335,36 @@ if __name__ == "__main__":
     json_files = [f for f in os.listdir(output_data_dir) if f.endswith('.json')]
 
     if not json_files:
-        if logger:
-            logger.warning(f"No .json files found in {output_data_dir}.")
+        logger.warning(f"No .json files found in {output_data_dir}.")
         print(f"No .json files found in {output_data_dir}.")
     else:
-        if logger:
-            logger.info(f"Found {len(json_files)} .json files in {output_data_dir}. Starting image generation per file.")
+        logger.info(f"Found {len(json_files)} .json files in {output_data_dir}. Starting image generation per file.")
         print(f"Found {len(json_files)} .json files in {output_data_dir}. Starting image generation per file.")
 
-        for json_file in json_files:
-            json_path = os.path.join(output_data_dir, json_file)
-            # Create a subdirectory in output/images based on the JSON filename (without extension)
-            subdir_name = os.path.splitext(json_file)[0]
-            output_subdir = os.path.join(output_images_base_dir, subdir_name)
-            os.makedirs(output_subdir, exist_ok=True)
+        # One generator for every file, so font/wrap/image caches and the worker pool stay warm
+        with ContentImageGenerator(output_dir=output_images_base_dir) as generator:
+            for json_file in json_files:
+                json_path = os.path.join(output_data_dir, json_file)
+                # Create a subdirectory in output/images based on the JSON filename (without extension)
+                subdir_name = os.path.splitext(json_file)[0]
+                output_subdir = os.path.join(output_images_base_dir, subdir_name)
+                os.makedirs(output_subdir, exist_ok=True)
 
-            if logger:
                 logger.info(f"Processing {json_file}. Output images will be saved to {output_subdir}")
-            print(f"Processing {json_file}. Output images will be saved to {output_subdir}")
+                print(f"Processing {json_file}. Output images will be saved to {output_subdir}")
 
-            try:
-                # Create a new generator instance for each JSON file, specifying the output subdirectory
-                generator = ContentImageGenerator(output_dir=output_subdir)
-                generator.generate_from_json(json_path)
+                try:
+                    # Point the shared generator at this JSON file's output subdirectory
+                    generator.set_output_dir(output_subdir)
+                    generator.generate_from_json(json_path)
 
-                if logger:
                     logger.info(f"Finished processing {json_file}.")
-                print(f"Finished processing {json_file}.")
+                    print(f"Finished processing {json_file}.")
 
-            except Exception as e:
-                if logger:
+                except Exception as e:
                     logger.error(f"An error occurred while processing {json_file}: {e}")
-                print(f"An error occurred while processing {json_file}: {e}")
-                # Continue to the next JSON file even if one fails
+                    print(f"An error occurred while processing {json_file}: {e}")
+                    # Continue to the next JSON file even if one fails
 
-    if logger:
-        logger.info("Content Image Generator script finished.")
+    logger.info("Content Image Generator script finished.")
     print("Content Image Generator script finished.") 
\ No newline at end of file
@@ -1,6 +1,12 @@
 # src/content/tts/generator.py
 
 import os
+import wave
+import hashlib
+import shutil
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 import yaml
 # Import potential TTS libraries - we will select one based on config
@@ -10,15 +16,34 @@ from gtts import gTTS # Import gTTS
 # Import the ContentImageGenerator to access the static _remove_urls method
 from src.content.generator import ContentImageGenerator # Assuming src.content is in sys.path
 
+# libyaml이 있으면 C 로더 사용 (순수 Python 로더보다 훨씬 빠름)
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# (config_path, mtime) -> 파싱된 설정, 인스턴스마다 YAML을 다시 파싱하지 않도록 프로세스 단위로 캐시
+_CONFIG_CACHE = {}
+
+# Piper 모델 경로 -> 로드된 PiperVoice, 모델은 프로세스당 한 번만 로드
+_PIPER_VOICES = {}
+
+# 로컬에서 CPU로 합성하는 엔진 - GIL 때문에 스레드 대신 프로세스 풀로 병렬화
+_PROCESS_POOL_ENGINES = ('piper',)
+
 class TTSGenerator:
     """Text-to-Speech 생성 클래스"""
-    def __init__(self, config_path="config/config.yaml"):
-        """TTSGenerator 초기화"""
-        self.config = self._load_config(config_path)
+    def __init__(self, config_path="config/config.yaml", config=None):
+        """
+        TTSGenerator 초기화 (이미 파싱한 설정 dict를 config로 넘기면 YAML을 다시 읽지 않음)
+        content.tts.cache_dir을 지정한 경우에만 음성 디스크 캐시를 사용하며, 캐시 항목은 자동으로 삭제되지 않습니다.
+        """
+        self.config_path = config_path
+        self.config = config if config is not None else self._load_config(config_path)
         self.tts_settings = self.config.get('content', {}).get('tts', {})
         self.engine = self.tts_settings.get('engine', 'gtts') # Default to gTTS
         self.language = self.tts_settings.get('language', 'en')
         self.slow = self.tts_settings.get('slow', False)
+        # 선택 사항: cache_dir을 지정하면 같은 설정/텍스트로 만든 음성을 디스크 캐시에서 복사 (기본 꺼짐)
+        # 캐시 항목은 자동으로 삭제되지 않으므로 cache_dir은 직접 정리해야 함
+        self.cache_dir = self.tts_settings.get('cache_dir')
         
         self._tts_engine = None
         logger.info(f"TTSGenerator initialized with engine: {self.engine}")
@@ -28,6 +53,18 @@ class TTSGenerator:
             if self.engine == 'gtts':
                 # gTTS does not require explicit initialization here
                 logger.info("gTTS engine selected.")
+            elif self.engine == 'piper':
+                # Piper는 로컬 ONNX 모델로 합성하므로 네트워크 왕복이 없음
+                from piper.voice import PiperVoice # Import here to avoid dependency if not used
+                model_path = self.tts_settings.get('piper_model')
+                if not model_path:
+                    raise ValueError("content.tts.piper_model must point to a Piper .onnx voice model")
+                voice = _PIPER_VOICES.get(model_path)
+                if voice is None:
+                    voice = _PIPER_VOICES[model_path] = PiperVoice.load(model_path)
+                    logger.info(f"Piper voice loaded from {model_path}")
+                self._tts_engine = voice
+                logger.info("Piper engine selected.")
             elif self.engine == 'pyttsx3':
                 # pyttsx3 requires initialization
                 # import pyttsx3 # Import here to avoid dependency if not used
@@ -45,12 +82,22 @@ class TTSGenerator:
             logger.error(f"Error initializing TTS engine {self.engine}: {e}")
             self.engine = None
 
+    @property
+    def uses_process_pool(self):
+        """로컬에서 CPU로 합성하는 엔진이면 True (generate_audio_batch가 스레드 대신 프로세스 풀 사용)"""
+        return self.engine in _PROCESS_POOL_ENGINES
+
     def _load_config(self, config_path):
         """설정 파일 로드"""
         try:
+            cache_key = (config_path, os.path.getmtime(config_path))
+            config = _CONFIG_CACHE.get(cache_key)
+            if config is not None:
+                return config
             with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YAML_LOADER)
             logger.info(f"Config loaded from {config_path}")
+            _CONFIG_CACHE[cache_key] = config
             return config
         except FileNotFoundError:
             logger.error(f"Config file not found at {config_path}")
@@ -59,17 +106,17 @@ class TTSGenerator:
             logger.error(f"Error loading config file {config_path}: {e}")
             return {}
 
-    def generate_audio(self, text: str, output_filepath: str):
+    def generate_audio(self, text: str, output_filepath: str, already_cleaned: bool = False):
         """
         주어진 텍스트를 음성으로 변환하여 파일로 저장
-        URL을 제거한 후 TTS를 수행합니다.
+        URL을 제거한 후 TTS를 수행합니다. 호출 측에서 이미 URL을 제거했다면 already_cleaned=True로 중복 처리를 건너뜁니다.
         """
         if not self.engine:
             logger.error("TTS engine is not initialized or supported. Cannot generate audio.")
             return False
 
         # --- Apply URL Removal ---
-        cleaned_text = ContentImageGenerator._remove_urls(text)
+        cleaned_text = text if already_cleaned else ContentImageGenerator._remove_urls(text)
         logger.info(f"Original text (first 50 chars): \'{text[:50]}...'")
         logger.info(f"Cleaned text (first 50 chars): \'{cleaned_text[:50]}...' to {output_filepath}")
         
@@ -89,6 +136,12 @@ class TTSGenerator:
                 os.makedirs(output_dir, exist_ok=True)
                 logger.debug(f"Created output directory: {output_dir}")
 
+            cached_filepath = self._get_cached_audio_path(text_to_synthesize)
+            if cached_filepath and os.path.exists(cached_filepath):
+                shutil.copyfile(cached_filepath, output_filepath)
+                logger.info(f"Cached audio reused for {output_filepath}")
+                return True
+
             if self.engine == 'gtts':
                 # gTTS generates audio directly to a file or BytesIO object
                 # from gtts import gTTS # Import here to avoid dependency if not used
@@ -98,6 +151,12 @@ class TTSGenerator:
                 # logger.warning("gTTS generation logic not fully implemented yet.")
                 # pass # Placeholder
 
+            elif self.engine == 'piper':
+                # Piper writes WAV data; ffmpeg (moviepy) detects the format from the content, not the extension
+                with wave.open(output_filepath, 'wb') as wav_file:
+                    self._tts_engine.synthesize(text_to_synthesize, wav_file)
+                logger.info(f"Piper audio saved to {output_filepath}")
+
             elif self.engine == 'pyttsx3':
                 # pyttsx3 uses engine.say() and engine.runAndWait()
                 # if self._tts_engine:
@@ -108,12 +167,72 @@ class TTSGenerator:
                 pass # Placeholder
 
             # logger.info(f"Audio generation placeholder completed for {output_filepath}") # Remove placeholder log
+            if cached_filepath and os.path.exists(output_filepath):
+                self._store_cached_audio(output_filepath, cached_filepath)
             return True # Return True on success
 
         except Exception as e:
             logger.error(f"Error during audio generation with {self.engine}: {e}")
             return False
 
+    def _get_cached_audio_path(self, text: str):
+        """캐시 키 (엔진, 언어, 속도, 모델, 텍스트)에 해당하는 캐시 파일 경로 반환 (캐시를 쓰지 않으면 None, 항목은 삭제되지 않음)"""
+        if not self.cache_dir:
+            return None
+        key_source = repr((self.engine, self.language, self.slow, self.tts_settings.get('piper_model'), text))
+        ext = '.wav' if self.engine == 'piper' else '.mp3'
+        return os.path.join(self.cache_dir, hashlib.sha1(key_source.encode('utf-8')).hexdigest() + ext)
+
+    def _store_cached_audio(self, output_filepath: str, cached_filepath: str):
+        """생성된 음성을 캐시에 저장 (임시 파일에 쓴 뒤 교체하므로 동시 작업이 반쯤 쓴 파일을 읽지 않음)"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_filepath = f"{cached_filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(output_filepath, tmp_filepath)
+            os.replace(tmp_filepath, cached_filepath)
+        except OSError as e:
+            logger.warning(f"Could not store cached audio for {output_filepath}: {e}")
+
+    def generate_audio_batch(self, jobs, max_workers=8, already_cleaned: bool = False):
+        """
+        여러 (text, output_filepath) 작업을 스레드 풀에서 동시에 음성으로 변환
+        gTTS는 요청마다 HTTPS 왕복을 기다리므로 스레드로 병렬화하면 전체 시간이 가장 긴 요청 수준으로 줄어듭니다.
+        max_workers로 동시 요청 수를 제한합니다 (rate limit 대비).
+        Piper처럼 로컬에서 합성하는 엔진은 프로세스 풀을 사용하며, 각 워커가 모델을 한 번만 로드해 계속 사용합니다.
+        jobs가 리스트가 아닌 제너레이터면 만들어지는 대로 작업을 넘기므로, 입력 파싱과 음성 생성이 겹쳐서 진행됩니다.
+
+        Returns:
+            list[bool]: 각 작업의 generate_audio 결과 (jobs 순서 유지)
+        """
+        if isinstance(jobs, (list, tuple)):
+            if not jobs:
+                return []
+            max_workers = min(max_workers, len(jobs))
+        if self.uses_process_pool:
+            processes = min(max_workers, os.cpu_count() or 1)
+            if processes > 1:
+                with multiprocessing.Pool(processes=processes, initializer=_init_tts_worker,
+                                          initargs=(self.config_path, self.config)) as pool:
+                    return list(pool.imap(_generate_audio_job,
+                                          ((text, output_filepath, already_cleaned) for text, output_filepath in jobs),
+                                          chunksize=4))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda job: self.generate_audio(*job, already_cleaned=already_cleaned), jobs))
+
+_worker_tts_generator = None
+
+
+def _init_tts_worker(config_path, config):
+    """Pool initializer: builds this worker process's TTSGenerator (and loads its voice model) once."""
+    global _worker_tts_generator
+    _worker_tts_generator = TTSGenerator(config_path=config_path, config=config)
+
+
+def _generate_audio_job(job):
+    """Synthesizes one (text, output_filepath, already_cleaned) job in a worker process."""
+    text, output_filepath, already_cleaned = job
+    return _worker_tts_generator.generate_audio(text, output_filepath, already_cleaned=already_cleaned)
+
 # Example usage (in a test script or main workflow)
 # if __name__ == "__main__":
 #     # Example of how to use the class
@@ -1,105 +1,128 @@
 # src/content/tts/test_generator.py
+# Run from the project root: python -m src.content.tts.test_generator
 
 import os
-import json # Import json to read the data file
 import re # Import re for sentence splitting
-from loguru import logger # Keep logger import for potential future use or consistency
+from loguru import logger
 import yaml # To read config for output directory
 import sys
-import glob
+import heapq
+import functools
 from datetime import datetime # Import the datetime class
 
-# Let's make it robust by finding the project root based on a known file like requirements.txt or src/main.py
-current_dir = os.path.dirname(os.path.abspath(__file__))
-# Corrected path calculation: need to go up three directories from src/content/tts/ to reach project root
-project_root = os.path.abspath(os.path.join(current_dir, "..", "..", ".."))
-sys.path.insert(0, project_root)
+# Run as a module (python -m) the src package is already importable and sys.path is left untouched.
+# Only a direct file run (python src/content/tts/test_generator.py) needs the project root added.
+if not __package__:
+    # Go up three directories from src/content/tts/ to reach project root
+    project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
 
 try:
     from src.content.tts.generator import TTSGenerator
-    from src.content.generator import ContentImageGenerator # URL 제거 함수를 위해 필요
+    from src.content.generator import ContentImageGenerator # 게시물 파서와 URL 제거
 except ImportError as e:
-    print(f"Failed to import modules: {e}")
-    print(f"Attempted to add '{project_root}' to sys.path. Current sys.path: {sys.path}")
+    logger.error(f"Failed to import modules: {e}")
+    logger.error("Run from the project root with: python -m src.content.tts.test_generator")
     sys.exit(1)
 
 # Assuming config file is at the project root
 CONFIG_PATH = "config/config.yaml"
 
+# Date stamp in a data filename: YYYY-MM-DD or YYYYMMDD
+_FILENAME_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})|(\d{8})')
+
+# URL removal shared with the image generator, memoized since boilerplate such as "[deleted]"
+# and cross-posted titles repeat across posts
+_clean = functools.lru_cache(maxsize=4096)(ContentImageGenerator._remove_urls)
+
+def _iter_utterances(post_data, post_id, max_comments):
+    """
+    Yields (text, output_filename, label) for every utterance of one post: the title, the body,
+    then the top max_comments comments by score. Text is returned as-is; callers clean it.
+    """
+    if (title_text := (post_data.get("title") or "").strip()):
+        # Ensure output filename includes post_id for uniqueness across posts
+        yield title_text, f"{post_id}_title_1.mp3", f"title of post {post_id}"
+
+    # Assuming body is a single part for audio generation in test
+    if (body_text := (post_data.get("body") or post_data.get('selftext') or "").strip()):
+        yield body_text, f"{post_id}_body_1.mp3", f"body of post {post_id}"
+
+    # Only the top N are needed, nlargest avoids sorting every comment
+    comments = heapq.nlargest(max_comments, post_data.get('comments', []), key=lambda c: c.get('score', 0))
+    for c_idx, comment in enumerate(comments):
+        # A comment with no body has nothing worth reading out, skip it before building the text
+        if (comment_body := (comment.get('body') or '').strip()):
+            comment_author = comment.get('author') or '[Deleted]'
+            yield f"{comment_author}: {comment_body}", f"{post_id}_comment{c_idx+1}_1.mp3", f"comment {c_idx+1} of post {post_id}"
+
 def load_config(config_path=CONFIG_PATH):
     """Load configuration from YAML file."""
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
             config = yaml.safe_load(f)
-        print(f"Config loaded from {config_path}")
+        logger.info(f"Config loaded from {config_path}")
         return config
     except FileNotFoundError:
-        print(f"Config file not found at {config_path}")
+        logger.error(f"Config file not found at {config_path}")
         return None
     except Exception as e:
-        print(f"Error loading config file {config_path}: {e}")
+        logger.error(f"Error loading config file {config_path}: {e}")
         return None
 
 def find_latest_json_data(base_output_dir="output"):
     """Find the latest JSON data file in the base output directory based on date in filename."""
     # Assuming JSON data is saved directly in the base output dir based on previous tests
-    output_json_files = glob.glob(os.path.join(base_output_dir, "*.json"))
+    # One scandir pass collects each file's path and ctime (the stat is reused by the ctime fallback)
+    try:
+        with os.scandir(base_output_dir) as entries:
+            output_json_files = [
+                (entry.path, entry.stat().st_ctime) for entry in entries
+                if entry.name.endswith('.json') and not entry.name.startswith('.') and entry.is_file()
+            ]
+    except FileNotFoundError:
+        output_json_files = []
     if not output_json_files:
-        print(f"No Reddit data JSON files found in {base_output_dir}.")
+        logger.warning(f"No Reddit data JSON files found in {base_output_dir}.")
         return None
 
+    # Pull one date out of each filename, then check candidates newest first.
+    # Only the date (not the subreddit prefix) orders the files, so they can't simply be sorted by name.
+    dated_files = []
+    for filepath, _ in output_json_files:
+        match = _FILENAME_DATE_RE.search(os.path.basename(filepath))
+        if match:
+            dated_files.append((match.group(1).replace('-', '') if match.group(1) else match.group(2), filepath))
+
     latest_file = None
-    latest_date = None
-    date_patterns = [
-        r'(\d{4}-\d{2}-\d{2})', # YYYY-MM-DD
-        r'(\d{8})' # YYYYMMDD
-    ]
-
-    for filepath in output_json_files:
-        filename = os.path.basename(filepath)
-        current_file_date = None
-
-        for pattern in date_patterns:
-            match = re.search(pattern, filename)
-            if match:
-                date_str = match.group(1)
-                try:
-                    # Try parsing with different formats
-                    if '-' in date_str:
-                        current_file_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    else:
-                         current_file_date = datetime.strptime(date_str, '%Y%m%d').date()
-                    break # Found and parsed a date, no need to try other patterns
-                except ValueError:
-                    continue # Mismatch with date format, try next pattern
-
-        if current_file_date:
-            if latest_date is None or current_file_date > latest_date:
-                latest_date = current_file_date
-                latest_file = filepath
-                print(f"Found potential latest file: {filename} with date {latest_date}") # Debug print
-        else:
-            print(f"Warning: Could not find or parse date from filename: {filename}") # Debug print
+    for date_key, filepath in sorted(dated_files, reverse=True):
+        try:
+            datetime.strptime(date_key, '%Y%m%d')
+        except ValueError:
+            continue # Digits that are not a real date, try the next newest
+        latest_file = filepath
+        break
 
     if latest_file:
-        print(f"Using latest data file based on filename date: {os.path.basename(latest_file)}")
+        logger.info(f"Scanned {len(output_json_files)} JSON files, using latest data file based on filename date: {os.path.basename(latest_file)}")
         return latest_file
     else:
-        print(f"No JSON data files with parsable dates found in {base_output_dir}. Fallback to ctime.")
+        logger.warning(f"No JSON data files with parsable dates found in {base_output_dir}. Fallback to ctime.")
         # Fallback to using creation time if no date found in filenames
         if output_json_files:
-             latest_json_file_ctime = max(output_json_files, key=os.path.getctime)
-             print(f"Using latest data file based on creation time: {os.path.basename(latest_json_file_ctime)}")
+             latest_json_file_ctime = max(output_json_files, key=lambda file_info: file_info[1])[0]
+             logger.info(f"Scanned {len(output_json_files)} JSON files, using latest data file based on creation time: {os.path.basename(latest_json_file_ctime)}")
              return latest_json_file_ctime
         else:
             return None # Should not happen based on initial check, but for safety
 
 def main():
-    print("TTS Test Script Started.")
+    logger.info("TTS Test Script Started.")
 
     config = load_config()
     if not config:
-        print("Failed to load configuration. Exiting.")
+        logger.error("Failed to load configuration. Exiting.")
         return
 
     # Define base output directories from config
@@ -108,107 +131,95 @@ def main():
 
     latest_data_file = find_latest_json_data(output_base_dir)
     if not latest_data_file:
-        print("No data file found to test with. Exiting.")
+        logger.warning("No data file found to test with. Exiting.")
         return
 
-    # Load the collected data
+    # Initialize TTS Generator with the config parsed above, so the YAML is only read once
+    tts_generator = TTSGenerator(config_path=CONFIG_PATH, config=config)
+
+    if not hasattr(tts_generator, 'generate_audio') or not callable(tts_generator.generate_audio):
+         logger.error("TTSGenerator does not have a callable generate_audio method. Exiting.")
+         return
+
+    max_comments_to_test = config.get('reddit', {}).get('max_comments_per_post', 3) # Use config or a default test limit
+    tts_workers = config.get('content', {}).get('tts', {}).get('workers', 8)
+    # Audio newer than the data file it was generated from is kept as is
+    data_mtime = os.path.getmtime(latest_data_file)
+    processed_posts = 0
+    skipped_count = 0
+    # (output_filepath, label) of every job handed to the TTS batch, in the order the results come back
+    pending_jobs = []
+
+    # Open the collected data; posts are stream-parsed one at a time (ijson) when available
     try:
-        with open(latest_data_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data_file = open(latest_data_file, "rb")
+        posts = ContentImageGenerator.iter_posts(data_file)
     except Exception as e:
-        print(f"Error loading JSON file {latest_data_file}: {e}")
+        logger.error(f"Error loading JSON file {latest_data_file}: {e}")
         return
 
-    # Get the first post and its ID for directory naming
-    posts = []
-    if isinstance(data, list):
-        posts = data
-    elif isinstance(data, dict) and "posts" in data and isinstance(data["posts"], list):
-        posts = data["posts"]
-
-    if not posts:
-        print(f"No post data found in {latest_data_file}. Exiting.")
+    if posts is None:
+        data_file.close()
+        logger.warning(f"No post data found in {latest_data_file}. Exiting.")
         return
 
-    # Initialize TTS Generator - assuming it needs config path
-    tts_generator = TTSGenerator(config_path=CONFIG_PATH)
+    def iter_audio_jobs():
+        """Yields (cleaned_text, output_filepath) jobs post by post, so TTS starts while later posts are still being parsed."""
+        nonlocal processed_posts, skipped_count
+        for post_index, post_data in enumerate(posts):
+            post_id = post_data.get("id")
 
-    if not hasattr(tts_generator, 'generate_audio') or not callable(tts_generator.generate_audio):
-         print("TTSGenerator does not have a callable generate_audio method. Exiting.")
-         return
+            processed_posts += 1
+            if not post_id:
+                logger.warning(f"Skipping post at index {post_index} with no id.")
+                continue
 
-    generated_count = 0
-
-    # --- Process each post in the data ---
-    for post_index, post_data in enumerate(posts):
-        post_id = post_data.get("id")
-
-        if not post_id:
-            print(f"Skipping post at index {post_index} with no id.")
-            continue
-
-        print(f"\nProcessing Post ID: {post_id}")
-
-        # Define the specific audio output directory for this post
-        post_audio_output_dir = os.path.join(audio_base_dir, post_id)
-        os.makedirs(post_audio_output_dir, exist_ok=True)
-        print(f"Audio for post {post_id} will be saved to: {post_audio_output_dir}")
-
-        # --- Generate Audio for Title ---
-        title_text = post_data.get("title", "").strip()
-        if title_text:
-            cleaned_text = ContentImageGenerator._remove_urls(title_text)
-            # Ensure output filename includes post_id for uniqueness across posts
-            output_filename = f"{post_id}_title_1.mp3"
-            output_filepath = os.path.join(post_audio_output_dir, output_filename)
-            print(f"  Generating audio for title of post {post_id}...")
-            if tts_generator.generate_audio(cleaned_text, output_filepath):
-                print(f"  Successfully generated: {output_filename}")
-                generated_count += 1
-            else:
-                print(f"  Failed to generate audio for title of post {post_id}.")
-
-        # --- Generate Audio for Body ---
-        body_text = post_data.get("body", post_data.get('selftext', '')).strip()
-        if body_text:
-            cleaned_text = ContentImageGenerator._remove_urls(body_text)
-            # Assuming body is a single part for audio generation in test
-            # Ensure output filename includes post_id
-            output_filename = f"{post_id}_body_1.mp3"
-            output_filepath = os.path.join(post_audio_output_dir, output_filename)
-            print(f"  Generating audio for body of post {post_id}...")
-            if tts_generator.generate_audio(cleaned_text, output_filepath):
-                print(f"  Successfully generated: {output_filename}")
-                generated_count += 1
-            else:
-                print(f"  Failed to generate audio for body of post {post_id}.")
-
-        # --- Generate Audio for Comments (Top N) ---
-        comments = sorted(post_data.get('comments', []), key=lambda c: c.get('score', 0), reverse=True)
-        max_comments_to_test = config.get('reddit', {}).get('max_comments_per_post', 3) # Use config or a default test limit
-        comments_to_process = comments[:max_comments_to_test]
-
-        if comments_to_process:
-            print(f"  Processing top {len(comments_to_process)} comments for post {post_id}...")
-            for c_idx, comment in enumerate(comments_to_process):
-                 comment_author = comment.get('author', '') or '[Deleted]'
-                 comment_body = comment.get('body', '') or ''
-                 comment_text = f"{comment_author}: {comment_body}".strip()
-
-                 if comment_text:
-                      cleaned_text = ContentImageGenerator._remove_urls(comment_text)
-                      # Assuming each comment is a single part for audio generation in test
-                      # Ensure output filename includes post_id
-                      output_filename = f"{post_id}_comment{c_idx+1}_1.mp3"
-                      output_filepath = os.path.join(post_audio_output_dir, output_filename)
-                      print(f"    Generating audio for comment {c_idx+1} of post {post_id}...")
-                      if tts_generator.generate_audio(cleaned_text, output_filepath):
-                           print(f"    Successfully generated: {output_filename}")
-                           generated_count += 1
-                      else:
-                           print(f"    Failed to generate audio for comment {c_idx+1} of post {post_id}.")
-
-    print(f"\nTTS Test Script Finished. Total audio files generated across all posts: {generated_count}")
+            logger.info(f"Processing Post ID: {post_id}")
+
+            # Define the specific audio output directory for this post
+            # Created here, before any of the post's jobs are handed out, so the workers never race on makedirs
+            post_audio_output_dir = os.path.join(audio_base_dir, post_id)
+            os.makedirs(post_audio_output_dir, exist_ok=True)
+            logger.info(f"Audio for post {post_id} will be saved to: {post_audio_output_dir}")
+
+            for text, output_filename, label in _iter_utterances(post_data, post_id, max_comments_to_test):
+                output_filepath = os.path.join(post_audio_output_dir, output_filename)
+                try:
+                    up_to_date = os.stat(output_filepath).st_mtime >= data_mtime
+                except OSError:
+                    up_to_date = False
+                if up_to_date:
+                    skipped_count += 1
+                    continue
+                pending_jobs.append((output_filepath, label))
+                yield _clean(text), output_filepath
+
+    # --- Generate audio concurrently (TTS calls are network bound) while the data is still being parsed ---
+    logger.info(f"Generating audio with up to {tts_workers} workers...")
+    with data_file:
+        # Every job text has already been through _clean
+        results = tts_generator.generate_audio_batch(iter_audio_jobs(), max_workers=tts_workers, already_cleaned=True)
+
+    if not processed_posts:
+        logger.warning(f"No post data found in {latest_data_file}. Exiting.")
+        return
+    if skipped_count:
+        logger.info(f"Skipped {skipped_count} audio files that were already up to date.")
+
+    for (output_filepath, label), success in zip(pending_jobs, results):
+        if success:
+            logger.info(f"Successfully generated: {os.path.basename(output_filepath)}")
+        else:
+            logger.error(f"Failed to generate audio for {label}.")
+    generated_count = skipped_count + sum(results)
+
+    logger.info(f"TTS Test Script Finished. Total audio files generated across all posts: {generated_count}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # Progress goes through a queued sink, so the post loop never waits on terminal writes
+    logger.remove()
+    logger.add(sys.stderr, enqueue=True, level="INFO")
+    try:
+        main()
+    finally:
+        logger.complete() # Drain the queue before the interpreter exits 
\ No newline at end of file
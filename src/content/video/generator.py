@@ -5,6 +5,7 @@ from moviepy.editor import ImageSequenceClip, AudioFileClip, CompositeVideoClip,
 from moviepy.audio.AudioClip import AudioArrayClip, AudioClip
 import numpy as np
 import glob
+import heapq
 import re # Import regex for filename parsing
 from moviepy.editor import vfx # Import visual effects, including speedx for audio
 import logging
@@ -23,7 +24,7 @@ except ImportError:
 try:
     # Assuming these can be imported relative to the project root
     # You might need to adjust sys.path if running this script directly requires it
-    from src.content.generator import ContentImageGenerator
+    from src.content.generator import ContentImageGenerator, IMAGE_EXT
     from src.content.tts.generator import TTSGenerator
 except ImportError as e:
     logger.error(f"Failed to import ContentImageGenerator or TTSGenerator: {e}. Ensure src directory is in sys.path or adjust imports.")
@@ -129,6 +130,10 @@ class VideoGenerator:
         except Exception as e:
             logger.error(f"An error occurred during video generation for {video_filename}: {e}")
             return None
+        finally:
+            # Release the decoded image frames right away instead of waiting for GC between posts
+            # (the audio clip belongs to the caller, which may still use it)
+            video_clip.close()
 
 
 # Add the updated find_latest_json_data function here (remove the old one if it exists below __init__)
@@ -322,9 +327,9 @@ if __name__ == "__main__":
                      logger.warning("Failed to generate audio for body.")
 
             # Generate audio for comments
-            sorted_comments = sorted(post_data.get('comments', []), key=lambda c: c.get('score', 0), reverse=True)
             max_comments_per_post = config.get('reddit', {}).get('max_comments_per_post', 5)
-            comments_to_process = sorted_comments[:max_comments_per_post]
+            # Only the top N are needed, nlargest avoids sorting every comment
+            comments_to_process = heapq.nlargest(max_comments_per_post, post_data.get('comments', []), key=lambda c: c.get('score', 0))
 
             if comments_to_process:
                 logger.info(f"Generating audio for top {len(comments_to_process)} comments...")
@@ -391,8 +396,8 @@ if __name__ == "__main__":
                          adjusted_duration = speed_adjusted_clip.duration
 
                          # Find the corresponding image(s) for this audio segment
-                         # Assuming image filenames contain the identifier (e.g., post_[index]_[post_id]_title_1.png)
-                         matching_images = [img_path for img_path in post_image_files if f"_{identifier}.png" in os.path.basename(img_path)]
+                         # Assuming image filenames contain the identifier (e.g., post_[index]_[post_id]_title_1.jpg)
+                         matching_images = [img_path for img_path in post_image_files if f"_{identifier}{IMAGE_EXT}" in os.path.basename(img_path)]
 
                          if matching_images:
                              # If there are multiple images for a single audio segment, we should divide the duration among them.
@@ -419,7 +424,7 @@ if __name__ == "__main__":
                     # Concatenate all processed audio clips for this post
                     if processed_audio_clips:
                         logger.info(f"Concatenating {len(processed_audio_clips)} audio clips for post {post_id}.")
-                        final_audio_clip = concatenate_videoclips(processed_audio_clips, method="compose")
+                        final_audio_clip = concatenate_audioclips(processed_audio_clips)
                         logger.info(f"Final audio clip duration for post {post_id}: {final_audio_clip.duration:.2f}s")
 
                         # Create image clip sequence with specific durations
@@ -1,5 +1,6 @@
 import os
-from typing import Dict, Any
+import hashlib
+from typing import Dict, Any, List
 # Assuming potential libraries for LLM interaction (e.g., transformers, torch)
 import torch
 from transformers import pipeline, set_seed
@@ -7,6 +8,15 @@ from loguru import logger
 import yaml # For reading config
 import re # Import regex module
 
+# Simple regex to find URLs (can be expanded if needed), compiled once instead of per post
+_URL_RE = re.compile(r'https?://\S+|www\.\S+')
+
+
+def _remove_urls(text):
+    """Removes URLs from text (still needed if we ever re-introduce comments into the prompt)"""
+    return _URL_RE.sub('', text).strip()
+
+
 class ShortsContentPlanner:
     def __init__(self, config_path="config/config.yaml"):
         """Shorts 콘텐츠 기획자 초기화"""
@@ -18,6 +28,11 @@ class ShortsContentPlanner:
         config_max_tokens = self.llm_settings.get('max_tokens', 30)
         self.max_tokens = min(config_max_tokens, 128) # Limit max_tokens to a reasonable value for a title (e.g., 128)
         self.temperature = self.llm_settings.get('temperature', 0.7)
+        # 본문 없이 제목만 짧은 게시물은 LLM 없이 원래 제목을 그대로 사용
+        self.skip_short_titles = self.llm_settings.get('skip_short_titles', True)
+        # 같은 모델/설정/프롬프트의 생성 결과는 디스크 캐시에서 재사용 (llm.cache_dir을 지정할 때만, 기본 꺼짐)
+        # 샘플링으로 나온 첫 결과가 고정되고 오래된 항목은 지워지지 않으므로 캐시 디렉토리는 직접 정리해야 함
+        self.cache_dir = self.llm_settings.get('cache_dir')
         
         # Define the model's maximum context length (specific to facebook/opt-1.3b or similar models)
         # This might need to be adjusted if self.model_name changes significantly
@@ -28,14 +43,46 @@ class ShortsContentPlanner:
         
         try:
             # Load the LLM model pipeline
-            self._llm_pipeline = pipeline('text-generation', model=self.model_name, device=0 if torch.cuda.is_available() else -1) # Use GPU if available
+            self._llm_pipeline = self._load_pipeline()
             set_seed(42) # for reproducibility
+            # 배치 생성을 위해 causal LM은 왼쪽 패딩, 패딩 토큰이 없으면 EOS로 대체
+            tokenizer = self._llm_pipeline.tokenizer
+            tokenizer.padding_side = 'left'
+            if tokenizer.pad_token_id is None:
+                tokenizer.pad_token_id = tokenizer.eos_token_id
             logger.info(f"Successfully loaded LLM model for title generation: {self.model_name}")
         except Exception as e:
             logger.error(f"Error loading LLM model {self.model_name} for title generation: {e}")
             logger.error("LLM model loading failed. Title planning will use a placeholder or fail.")
             self._llm_pipeline = None # Ensure pipeline is None if loading fails
 
+    def _load_pipeline(self):
+        """
+        text-generation 파이프라인 로드
+        GPU에서 llm.quantization이 '8bit'/'4bit'이면 bitsandbytes로 가중치를 양자화해 로드합니다 (디코딩 시 읽는 가중치 바이트가 1/2~1/4).
+        bitsandbytes가 없거나 양자화 로드에 실패하면 GPU에서는 fp16으로, CPU에서는 기존처럼 기본 정밀도로 로드합니다.
+        """
+        if not torch.cuda.is_available():
+            return pipeline('text-generation', model=self.model_name, device=-1)
+
+        quantization = self.llm_settings.get('quantization')
+        if quantization:
+            try:
+                from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig
+                if quantization == '4bit':
+                    quantization_config = BitsAndBytesConfig(load_in_4bit=True, bnb_4bit_compute_dtype=torch.float16, bnb_4bit_quant_type='nf4')
+                elif quantization == '8bit':
+                    quantization_config = BitsAndBytesConfig(load_in_8bit=True)
+                else:
+                    raise ValueError(f"llm.quantization must be '8bit' or '4bit', got {quantization!r}")
+                model = AutoModelForCausalLM.from_pretrained(self.model_name, quantization_config=quantization_config, device_map='auto')
+                tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                logger.info(f"Loaded {self.model_name} with {quantization} quantization")
+                return pipeline('text-generation', model=model, tokenizer=tokenizer)
+            except Exception as e:
+                logger.warning(f"Could not load {self.model_name} with {quantization} quantization ({e}). Falling back to fp16.")
+        return pipeline('text-generation', model=self.model_name, device=0, torch_dtype=torch.float16)
+
     def _load_config(self, config_path):
         """설정 파일 로드"""
         try:
@@ -52,60 +99,77 @@ class ShortsContentPlanner:
 
     def plan_content(self, post_data: Dict[str, Any]) -> Dict[str, str]:
         """주어진 게시물 데이터를 바탕으로 Shorts 제목만 기획"""
-        post_id = post_data.get('id', 'unknown_post')
-        logger.info(f"Planning title for post: {post_id}")
-
-        title = post_data.get('title', '').strip() # Get and strip title
-        body = post_data.get('selftext', '').strip()
-        comments = post_data.get('comments', []) # Keep comments available internally if needed later
-        
-        # Function to remove URLs from text (Still needed if we ever re-introduce comments)
-        def remove_urls(text):
-            # Simple regex to find URLs (can be expanded if needed)
-            url_pattern = re.compile(r'https?://\S+|www\.\S+')
-            return url_pattern.sub('', text).strip()
-
-        # Construct a prompt for the LLM focused on title generation
-        # Limit body length to prevent exceeding max context length
-        max_body_length = 400 # Hardcoded limit for now
-        truncated_body = body
-        if len(body) > max_body_length:
-            truncated_body = body[:max_body_length].rsplit(' ', 1)[0] + '...' # Truncate and end at last full word
-            logger.debug(f"Truncated post body from {len(body)} to {len(truncated_body)} characters.")
+        return self.plan_content_batch([post_data])[0]
 
-        prompt = f"""You are a creative YouTube Shorts content creator. Your goal is to make people stop scrolling and watch the video.
-I will provide you with a Reddit post title and body. Your task is to generate a HYPER-ENGAGING and VIRAL-WORTHY YouTube Shorts video title based on this content.
+    def plan_content_batch(self, post_data_list: List[Dict[str, Any]], batch_size: int = 8) -> List[Dict[str, str]]:
+        """
+        여러 게시물의 Shorts 제목을 한 번의 파이프라인 호출로 기획
+        프롬프트를 batch_size개씩 묶어 한 번의 forward pass로 생성하므로 게시물마다 호출하는 것보다 처리량이 높습니다.
+        결과는 post_data_list 순서와 같습니다.
+        """
+        plans = [None] * len(post_data_list)
+        post_ids = []
+        prompts = []
+        pending_indices = [] # LLM으로 생성할 게시물의 post_data_list 인덱스
+        for i, post_data in enumerate(post_data_list):
+            post_id = post_data.get('id', 'unknown_post')
+            logger.info(f"Planning title for post: {post_id}")
+            title = post_data.get('title', '').strip()
+            if self.skip_short_titles and title and len(title) <= 60 and not post_data.get('selftext', '').strip():
+                logger.debug(f"Post {post_id} has a short title and no body. Using the title as is without the LLM.")
+                plans[i] = {"youtube_title": title, "youtube_description": ""}
+                continue
+            post_ids.append(post_id)
+            prompts.append(self._build_prompt(post_id, post_data))
+            pending_indices.append(i)
 
-Reddit Post Title: {title if title else 'N/A'}
+        if not prompts:
+            return plans
 
-Reddit Post Body: {truncated_body if truncated_body else 'N/A'}
+        # 같은 모델/설정/프롬프트로 이미 생성한 응답은 디스크 캐시에서 재사용하고 나머지만 LLM으로 생성
+        cache_paths = [self._get_cached_response_path(prompt) for prompt in prompts]
+        raw_generated_texts = [self._load_cached_response(cache_path) for cache_path in cache_paths]
+        missing = [j for j, raw_generated_text in enumerate(raw_generated_texts) if raw_generated_text is None]
+        if len(missing) < len(prompts):
+            logger.info(f"Reusing cached LLM responses for {len(prompts) - len(missing)} of {len(prompts)} posts.")
+        if missing:
+            generated_texts, generated = self._generate_texts([post_ids[j] for j in missing], [prompts[j] for j in missing], batch_size)
+            for j, raw_generated_text in zip(missing, generated_texts):
+                raw_generated_texts[j] = raw_generated_text
+                if generated:
+                    self._store_cached_response(cache_paths[j], raw_generated_text)
 
-"""
-        
-        prompt += f"""
-
-Please generate the YouTube Shorts title:
-"""
-        
-        logger.debug(f"LLM Prompt for post {post_id} (Title Only):\n{prompt[:500]}...") # Log first 500 chars of prompt
+        for i, post_id, prompt, raw_generated_text in zip(pending_indices, post_ids, prompts, raw_generated_texts):
+            plans[i] = self._parse_response(post_id, prompt, raw_generated_text)
+        return plans
 
+    def _generate_texts(self, post_ids: List[str], prompts: List[str], batch_size: int):
+        """
+        프롬프트 목록을 batch_size개씩 묶어 LLM으로 생성
+        Returns:
+            tuple[list[str], bool]: (프롬프트별 원본 생성 텍스트, 실제로 생성에 성공했는지 여부 - 실패 시 기본 오류 텍스트)
+        """
         # --- Call the actual LLM API ---
-        raw_generated_text = "LLM model not available or failed to generate.\nYouTube Title: Generation Error"
+        raw_generated_texts = ["LLM model not available or failed to generate.\nYouTube Title: Generation Error"] * len(prompts)
+        generated = False
         if self._llm_pipeline:
             try:
                 # Calculate max_length, ensuring it doesn't exceed the model's max context length
                 # Also ensure it's at least the prompt length + a few tokens for the tag
+                # 배치는 하나의 max_length를 쓰므로 가장 긴 프롬프트 기준으로 계산
                 min_response_length = 20 # Minimum expected output length for title text
-                calculated_max_length = len(prompt) + self.max_tokens
+                longest_prompt_length = max(len(prompt) for prompt in prompts)
+                calculated_max_length = longest_prompt_length + self.max_tokens
                 
                 # Ensure calculated_max_length doesn't exceed the model's max context length
                 # And that it's at least long enough to potentially contain the prompt + minimal response
-                safe_max_length = max(len(prompt) + min_response_length, min(calculated_max_length, self.max_model_length))
+                safe_max_length = max(longest_prompt_length + min_response_length, min(calculated_max_length, self.max_model_length))
 
-                logger.debug(f"Using safe_max_length: {safe_max_length} (Prompt length: {len(prompt)}, max_tokens: {self.max_tokens}, Model max: {self.max_model_length})")
+                logger.debug(f"Using safe_max_length: {safe_max_length} (Longest prompt length: {longest_prompt_length}, max_tokens: {self.max_tokens}, Model max: {self.max_model_length})")
 
-                response = self._llm_pipeline(
-                    prompt,
+                responses = self._llm_pipeline(
+                    prompts,
+                    batch_size=min(batch_size, len(prompts)),
                     max_length=safe_max_length, 
                     num_return_sequences=1,
                     temperature=self.temperature,
@@ -113,18 +177,86 @@ Please generate the YouTube Shorts title:
                     return_full_text=True,
                     truncation=True # Explicitly allow truncation if prompt is too long
                 )
-                # The pipeline with return_full_text=True returns the prompt + generated text
-                raw_generated_text = response[0]['generated_text']
-                logger.debug(f"LLM Raw Generated Response for post {post_id}:\n{raw_generated_text}")
+                # The pipeline with return_full_text=True returns the prompt + generated text (one list per prompt)
+                raw_generated_texts = [response[0]['generated_text'] for response in responses]
+                generated = True
+                for post_id, raw_generated_text in zip(post_ids, raw_generated_texts):
+                    logger.debug(f"LLM Raw Generated Response for post {post_id}:\n{raw_generated_text}")
 
             except Exception as e:
-                logger.error(f"Error during LLM text generation for post {post_id}: {e}")
-                # Keep the default error message in raw_generated_text
+                logger.error(f"Error during LLM text generation for posts {', '.join(post_ids)}: {e}")
+                # Keep the default error message in raw_generated_texts
         else:
-             logger.warning(f"LLM pipeline not loaded for post {post_id}. Using default error response.")
+             logger.warning(f"LLM pipeline not loaded for {len(prompts)} posts. Using default error response.")
 
         # --- End LLM API Call ---
 
+        return raw_generated_texts, generated
+
+    def _get_cached_response_path(self, prompt: str):
+        """캐시 키 (모델, 생성 설정, 프롬프트)에 해당하는 캐시 파일 경로 반환 (캐시를 쓰지 않으면 None)"""
+        if not self.cache_dir:
+            return None
+        key_source = repr((self.model_name, self.llm_settings.get('quantization'), self.max_tokens, self.temperature, prompt))
+        return os.path.join(self.cache_dir, hashlib.blake2b(key_source.encode('utf-8'), digest_size=16).hexdigest() + '.txt')
+
+    @staticmethod
+    def _load_cached_response(cache_path):
+        """캐시된 원본 생성 텍스트 반환 (없으면 None)"""
+        if not cache_path:
+            return None
+        try:
+            with open(cache_path, 'r', encoding='utf-8', newline='') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store_cached_response(self, cache_path, raw_generated_text: str):
+        """생성된 텍스트를 캐시에 저장 (임시 파일에 쓴 뒤 교체하므로 동시 실행이 반쯤 쓴 파일을 읽지 않음)"""
+        if not cache_path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(raw_generated_text)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not store cached LLM response at {cache_path}: {e}")
+
+    def _build_prompt(self, post_id: str, post_data: Dict[str, Any]) -> str:
+        """게시물 제목/본문으로 제목 생성용 프롬프트 구성"""
+        title = post_data.get('title', '').strip() # Get and strip title
+        body = post_data.get('selftext', '').strip()
+        comments = post_data.get('comments', []) # Keep comments available internally if needed later
+
+        # Construct a prompt for the LLM focused on title generation
+        # Limit body length to prevent exceeding max context length
+        max_body_length = 400 # Hardcoded limit for now
+        truncated_body = body
+        if len(body) > max_body_length:
+            truncated_body = body[:max_body_length].rsplit(' ', 1)[0] + '...' # Truncate and end at last full word
+            logger.debug(f"Truncated post body from {len(body)} to {len(truncated_body)} characters.")
+
+        prompt = f"""You are a creative YouTube Shorts content creator. Your goal is to make people stop scrolling and watch the video.
+I will provide you with a Reddit post title and body. Your task is to generate a HYPER-ENGAGING and VIRAL-WORTHY YouTube Shorts video title based on this content.
+
+Reddit Post Title: {title if title else 'N/A'}
+
+Reddit Post Body: {truncated_body if truncated_body else 'N/A'}
+
+"""
+        
+        prompt += f"""
+
+Please generate the YouTube Shorts title:
+"""
+        
+        logger.debug(f"LLM Prompt for post {post_id} (Title Only):\n{prompt[:500]}...") # Log first 500 chars of prompt
+        return prompt
+
+    def _parse_response(self, post_id: str, prompt: str, raw_generated_text: str) -> Dict[str, str]:
+        """LLM 출력에서 제목 추출"""
         # Parse the generated text to extract title
         youtube_title = "Generated Title Placeholder"
         youtube_description = ""
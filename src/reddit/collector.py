@@ -1,5 +1,6 @@
 import praw
 import os
+import heapq
 from datetime import datetime
 from loguru import logger
 from typing import List, Dict, Any
@@ -80,9 +81,8 @@ class RedditCollector:
         try:
             submission = self.reddit.submission(id=post_id)
             submission.comments.replace_more(limit=0)
-            comments = list(submission.comments.list())
-            comments.sort(key=lambda x: x.score, reverse=True)
-            top_comments = comments[:limit]
+            # 상위 limit개만 필요하므로 전체 정렬 대신 heapq.nlargest 사용
+            top_comments = heapq.nlargest(limit, submission.comments.list(), key=lambda x: x.score)
             comment_data_list = []
             for comment in top_comments:
                 # Initialize basic comment data
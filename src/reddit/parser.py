@@ -5,6 +5,12 @@ from pathlib import Path
 from typing import Dict, List, Any
 from loguru import logger
 
+# orjson은 선택 사항 - 설치되어 있으면 표준 json보다 빠르게 파싱
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class RedditParser:
     def __init__(self, output_dir: str = "output", max_files_per_subreddit: int = 5):
         """Reddit 데이터 파서 초기화"""
@@ -55,8 +61,8 @@ class RedditParser:
     def load_posts(self, filepath: str) -> List[Dict[str, Any]]:
         """저장된 게시물 데이터 로드"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                posts = json.load(f)
+            with open(filepath, 'rb') as f:
+                posts = orjson.loads(f.read()) if orjson is not None else json.load(f)
             logger.info(f"Loaded {len(posts)} posts from {filepath}")
             return posts
         except Exception as e:
@@ -1,15 +1,31 @@
 import os
-from moviepy.editor import ImageSequenceClip, AudioFileClip, CompositeVideoClip, concatenate_videoclips, ColorClip, concatenate_audioclips
-from moviepy.audio.AudioClip import AudioArrayClip, AudioClip
-import numpy as np
-import glob
-import json
+import sys
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from moviepy.config import get_setting
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+import heapq
 import re # Import regex for filename parsing
-from moviepy.editor import vfx # Import visual effects, including speedx for audio
 import logging
 import yaml
 from datetime import datetime
 
+# moviepy가 사용하는 것과 같은 ffmpeg 실행 파일 (imageio-ffmpeg 또는 FFMPEG_BINARY 환경 변수)
+FFMPEG_BINARY = get_setting("FFMPEG_BINARY")
+FFPROBE_BINARY = shutil.which("ffprobe")
+
+# 데이터 파일 이름의 날짜: YYYY-MM-DD 또는 YYYYMMDD
+_FILENAME_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})|(\d{8})')
+
+# 댓글 파트 이미지 파일 이름 (post_<idx>_comment_<댓글 idx>_part_<파트 idx><확장자>)과 댓글 오디오 식별자 (comment<N>_<파트>)
+_COMMENT_PART_IMAGE_RE = re.compile(r'comment_(\d+)_part_(\d+)(\.\w+)$')
+_COMMENT_SEGMENT_RE = re.compile(r'comment(\d+)_(\d+)')
+_COMMENT_SIMPLE_RE = re.compile(r'comment(\d+)')
+
+# (절대 경로, mtime, 크기) -> 오디오 길이(초), 같은 파일을 여러 번 probe하지 않도록 프로세스 단위로 캐시
+_DURATION_CACHE = {}
+
 # 기존 logger 설정을 따르거나 기본 로거 사용
 try:
     from loguru import logger
@@ -20,7 +36,15 @@ except ImportError:
 
 def find_latest_json_data(base_output_dir="output"):
         """Find all JSON data files in the base output directory that have the latest date in their filename."""
-        output_json_files = glob.glob(os.path.join(base_output_dir, "*.json"))
+        # One scandir pass collects each file's path and ctime (the ctime fallback reuses the DirEntry stat)
+        try:
+            with os.scandir(base_output_dir) as entries:
+                output_json_files = [
+                    (entry.path, entry.name, entry.stat().st_ctime) for entry in entries
+                    if entry.name.endswith('.json') and not entry.name.startswith('.') and entry.is_file()
+                ]
+        except FileNotFoundError:
+            output_json_files = []
         if not output_json_files:
             logger.warning(f"No Reddit data JSON files found in {base_output_dir}.")
             return [] # Return empty list if no files
@@ -28,28 +52,19 @@ def find_latest_json_data(base_output_dir="output"):
         latest_date = None
         date_to_files_map = {} # Map date objects to a list of file paths
 
-        date_patterns = [
-            r'(\d{4}-\d{2}-\d{2})', # YYYY-MM-DD
-            r'(\d{8})' # YYYYMMDD
-        ]
-
-        for filepath in output_json_files:
-            filename = os.path.basename(filepath)
+        for filepath, filename, _ in output_json_files:
             current_file_date = None
 
-            for pattern in date_patterns:
-                match = re.search(pattern, filename)
-                if match:
-                    date_str = match.group(1)
-                    try:
-                        # Try parsing with different formats
-                        if '-' in date_str:
-                            current_file_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                        else:
-                            current_file_date = datetime.strptime(date_str, '%Y%m%d').date()
-                        break # Found and parsed a date, no need to try other patterns
-                    except ValueError:
-                        continue # Mismatch with date format, try next pattern
+            # One search finds either date form; the group that matched says which format to parse
+            match = _FILENAME_DATE_RE.search(filename)
+            if match:
+                try:
+                    if match.group(1):
+                        current_file_date = datetime.strptime(match.group(1), '%Y-%m-%d').date()
+                    else:
+                        current_file_date = datetime.strptime(match.group(2), '%Y%m%d').date()
+                except ValueError:
+                    pass # Digits that are not a real date
 
             if current_file_date:
                 # Update latest_date if this file is newer
@@ -72,7 +87,7 @@ def find_latest_json_data(base_output_dir="output"):
             # Fallback to using creation time if no date found in filenames with parsable date
             if output_json_files:
                 logger.info("Falling back to finding the single latest file based on creation time.")
-                latest_json_file_ctime = max(output_json_files, key=os.path.getctime)
+                latest_json_file_ctime = max(output_json_files, key=lambda file_info: file_info[2])[0]
                 logger.info(f"Using latest data file based on creation time: {os.path.basename(latest_json_file_ctime)}")
                 return [latest_json_file_ctime] # Return a list containing the single latest file
             else:
@@ -84,14 +99,19 @@ class VideoGenerator:
     Generates video clips from a sequence of images and an audio file.
     """
 
-    def __init__(self, output_dir="output/videos"):
+    def __init__(self, output_dir="output/videos", encoder=None):
         """
         Initializes the VideoGenerator.
 
         Args:
             output_dir (str): Directory to save the generated videos.
+            encoder (str | None): H.264 encoder to use ('libx264', 'h264_nvenc', 'h264_qsv', 'h264_videotoolbox'),
+                                  or None to use the fastest one that works on this machine.
         """
+        if encoder is not None and encoder != 'libx264' and encoder not in _HW_VIDEO_ENCODERS:
+            raise ValueError(f"Unsupported video encoder: {encoder}")
         self.output_dir = output_dir
+        self.encoder = encoder
         os.makedirs(self.output_dir, exist_ok=True)
         logger.debug(f"Created output directory: {self.output_dir}")
 
@@ -99,16 +119,26 @@ class VideoGenerator:
     
 
     def generate_video(
-        self, image_duration_list: list[tuple[str, float]], audio_clip: AudioClip, video_filename: str
+        self, image_duration_list: list[tuple[str, float]], audio_clip, video_filename: str, threads: int = 4,
+        audio_speed_factor: float = 1.0
     ):
         """
         Generates a video clips from a sequence of images and an audio file.
+        FFmpeg reads the images itself through its concat demuxer and encodes them, so no frame
+        passes through Python/numpy on the way. Without audio the same command just leaves out the audio input.
+        A list of audio segments is joined by a second concat demuxer input of the same command, so the segments
+        are decoded and encoded (AAC) once, with no intermediate concatenated audio file.
 
         Args:
             image_duration_list (list[tuple[str, float]]): List of tuples where each tuple contains
                                                            (image_file_path: str, duration_in_seconds: float).
-            audio_clip (AudioClip): The moviepy AudioClip object.
+            audio_clip (str | list[str] | AudioClip | None): Path to the audio file, audio segment paths to play in order,
+                                                 a moviepy AudioClip or anything else with write_audiofile
+                                                 (written to a temporary WAV first),
+                                                 or None for a video without audio.
             video_filename (str): The name for the output video file (without extension).
+            threads (int): Number of libx264 encoder threads for this FFmpeg process (unused by hardware encoders).
+            audio_speed_factor (float): Playback speed applied to the audio with atempo (pitch is kept).
         
         Returns:
             str: Path to the generated video file.
@@ -120,44 +150,544 @@ class VideoGenerator:
             return None
 
         if not audio_clip:
-            logger.error("No final audio clip provided. Cannot generate video.")
-            return None
+            logger.warning("No final audio clip provided. Generating video without audio.")
 
-        # 이미지 파일 경로 리스트와 해당 이미지들의 지속 시간 리스트 분리
-        image_files = [item[0] for item in image_duration_list]
-        durations = [item[1] for item in image_duration_list]
-
-        if len(image_files) != len(durations):
-            logger.error(f"Mismatch between number of image files ({len(image_files)}) and durations ({len(durations)}). Cannot generate video.")
-            return None
-
-        total_image_duration = sum(durations)
-        audio_duration = audio_clip.duration
-
-        # 이미지 시퀀스 클립 생성
-        # durations 인자로 각 이미지의 표시 시간을 설정합니다.
-        video_clip = ImageSequenceClip(image_files, durations=durations)
-        logger.info(f"Created image sequence clip with total duration {video_clip.duration:.2f} seconds.")
-
-        # 오디오 클립을 영상 클립에 설정
-        final_clip = video_clip.set_audio(audio_clip)
+        total_image_duration = sum(duration for _, duration in image_duration_list)
 
         # 최종 영상 파일 경로 설정
         output_filepath = os.path.join(self.output_dir, f"{video_filename}.mp4") # MP4 확장자 사용
 
-        # 최종 영상 파일 저장
-        # codec='libx264'는 MP4를 위한 일반적인 코덱입니다.
-        # fps=24는 프레임 속도입니다. Shorts에 적합한 설정을 고려해야 합니다.
-        # threads=4는 인코딩에 사용할 스레드 수입니다.
-        logger.info(f"Writing final video to {output_filepath}...")
+        # concat 목록과 (필요하면) 임시 오디오 파일은 영상 옆에 만들고 끝나면 삭제
+        concat_list_path = os.path.join(self.output_dir, f".{video_filename}_images.txt")
+        audio_list_path = None
+        temp_audio_path = None
         try:
-            # Write video file. Using preset='medium' as a balance between speed and quality
-            final_clip.write_videofile(output_filepath, codec='libx264', fps=24, threads=4, preset='medium')
+            _write_concat_list(image_duration_list, concat_list_path)
+            logger.info(f"Created image concat list with total duration {total_image_duration:.2f} seconds.")
+
+            audio_input = []
+            if not audio_clip or isinstance(audio_clip, str):
+                audio_path = audio_clip
+            elif isinstance(audio_clip, (list, tuple)):
+                audio_list_path = audio_path = os.path.join(self.output_dir, f".{video_filename}_audio.txt")
+                _write_audio_concat_list(audio_clip, audio_list_path)
+                audio_input = ['-f', 'concat', '-safe', '0']
+            else:
+                temp_audio_path = os.path.join(self.output_dir, f".{video_filename}_audio.wav")
+                audio_clip.write_audiofile(temp_audio_path, fps=44100, logger=None)
+                audio_path = temp_audio_path
+
+            # 최종 영상 파일 저장
+            # codec='libx264'는 MP4를 위한 일반적인 코덱입니다.
+            # fps=24는 프레임 속도입니다. Shorts에 적합한 설정을 고려해야 합니다.
+            # -threads는 이 FFmpeg 프로세스의 인코딩 스레드 수입니다.
+            # 하드웨어 H.264 인코더(NVENC/VideoToolbox/QSV)가 있으면 사용하고, 없으면 libx264로 인코딩합니다.
+            input_args = [FFMPEG_BINARY, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', concat_list_path]
+            if audio_path:
+                input_args += [*audio_input, '-i', audio_path]
+
+            def build_command(encoder_args):
+                # fps 필터는 concat의 duration 타임스탬프대로 프레임을 복제하고, -t로 이미지 목록 길이에서 정확히 자름
+                # (출력 -r은 마지막으로 반복한 이미지를 더 길게 보여주는 등 타이밍이 어긋남)
+                command = [*input_args, *encoder_args, '-pix_fmt', 'yuv420p', '-vf', 'fps=24']
+                if encoder_args is _LIBX264_ARGS:
+                    # 하드웨어 인코더는 인코딩을 GPU/전용 블록에서 하므로 스레드 수는 libx264에만 의미가 있음
+                    command += ['-threads', str(threads)]
+                command += ['-t', f"{total_image_duration:.3f}"]
+                if audio_path:
+                    if audio_speed_factor != 1.0:
+                        command += ['-filter:a', _atempo_filter(audio_speed_factor)]
+                    command += ['-c:a', 'aac', '-shortest']
+                # moov atom을 파일 앞에 두어 업로드/재생 시 전체를 받기 전에 시작할 수 있게 함 (별도 재작성 패스 불필요)
+                return command + ['-movflags', '+faststart', output_filepath]
+
+            if self.encoder is None:
+                encoder_args = _get_video_encoder_args()
+            else:
+                encoder_args = _LIBX264_ARGS if self.encoder == 'libx264' else _HW_VIDEO_ENCODERS[self.encoder]
+            logger.info(f"Writing final video to {output_filepath}...")
+            try:
+                subprocess.run(build_command(encoder_args), check=True, capture_output=True)
+            except subprocess.CalledProcessError as e:
+                # 자동 선택한 하드웨어 인코더는 동시 인코딩 세션 수 제한(NVENC/QSV) 등으로 실패할 수 있으므로
+                # 이 영상만 libx264로 한 번 더 인코딩 (encoder를 직접 지정했다면 그대로 실패 처리)
+                if self.encoder is not None or encoder_args is _LIBX264_ARGS:
+                    raise
+                logger.warning(f"{encoder_args[1]} failed for {output_filepath}, retrying with libx264: "
+                               f"{e.stderr.decode('utf-8', 'replace').strip()}")
+                subprocess.run(build_command(_LIBX264_ARGS), check=True, capture_output=True)
             logger.info(f"Successfully generated Shorts video: {output_filepath}")
             return output_filepath
+        except subprocess.CalledProcessError as e:
+            logger.error(f"FFmpeg failed while generating {output_filepath}: {e.stderr.decode('utf-8', 'replace').strip()}")
+            return None
         except Exception as e:
             logger.error(f"An error occurred during video generation: {e}")
             return None
+        finally:
+            for temp_path in (concat_list_path, audio_list_path, temp_audio_path):
+                if temp_path and os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+
+# 하드웨어 H.264 인코더 이름 -> FFmpeg 인코더 인자 (플랫폼별 시도 순서는 _get_video_encoder_args에서 결정)
+# libx264와 같이 키프레임은 최대 2초(48프레임) 간격
+_HW_VIDEO_ENCODERS = {
+    'h264_nvenc': ['-c:v', 'h264_nvenc', '-preset', 'p1', '-tune', 'll', '-rc', 'vbr', '-cq', '23', '-b:v', '5M', '-g', '48'],
+    'h264_videotoolbox': ['-c:v', 'h264_videotoolbox', '-b:v', '5M', '-g', '48'],
+    'h264_qsv': ['-c:v', 'h264_qsv', '-preset', 'veryfast', '-global_quality', '23', '-g', '48'],
+}
+# 정지 이미지 슬라이드쇼라 움직임 탐색이 거의 필요 없으므로 veryfast + stillimage 튜닝을 사용하고,
+# 키프레임은 최대 2초(48프레임) 간격으로 둡니다.
+_LIBX264_ARGS = ['-c:v', 'libx264', '-preset', 'veryfast', '-tune', 'stillimage', '-x264-params', 'keyint=48:min-keyint=24']
+_video_encoder_args = None
+
+
+def _get_video_encoder_args():
+    """
+    Returns the FFmpeg video encoder arguments, probed once per process.
+    A hardware encoder is used only if FFmpeg lists it and a tiny test encode with it succeeds
+    (builds often list NVENC/QSV on machines without the hardware); otherwise libx264.
+    """
+    global _video_encoder_args
+    if _video_encoder_args is None:
+        _video_encoder_args = _LIBX264_ARGS
+        if sys.platform == 'darwin':
+            candidates = ['h264_videotoolbox']
+        else:
+            candidates = ['h264_nvenc', 'h264_qsv']
+        try:
+            encoders = subprocess.run([FFMPEG_BINARY, '-hide_banner', '-encoders'], capture_output=True, text=True).stdout
+        except OSError:
+            encoders = ''
+        for name in candidates:
+            if name not in encoders:
+                continue
+            test_command = [FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1',
+                            *_HW_VIDEO_ENCODERS[name], '-pix_fmt', 'yuv420p', '-f', 'null', '-']
+            if subprocess.run(test_command, capture_output=True).returncode == 0:
+                _video_encoder_args = _HW_VIDEO_ENCODERS[name]
+                break
+        logger.info(f"Video encoder: {_video_encoder_args[1]}")
+    return _video_encoder_args
+
+
+def _concat_quote(path):
+    """Quotes a path as an absolute, single-quoted FFmpeg concat script entry."""
+    return "'" + os.path.abspath(path).replace("'", "'\\''") + "'"
+
+
+def _write_concat_list(image_duration_list, concat_list_path):
+    """
+    Writes an FFmpeg concat demuxer script (absolute paths) that shows each image for its duration.
+    The demuxer ignores the last entry's duration, so the last image is listed once more to hold it.
+    """
+    lines = []
+    for image_path, duration in image_duration_list:
+        lines.append(f"file {_concat_quote(image_path)}\nduration {duration:.3f}\n")
+    lines.append(f"file {_concat_quote(image_path)}\n")
+    with open(concat_list_path, "w", encoding="utf-8") as f:
+        f.write("".join(lines))
+
+
+def _write_audio_concat_list(audio_paths, concat_list_path):
+    """Writes an FFmpeg concat demuxer script (absolute paths) that plays the audio files end to end."""
+    with open(concat_list_path, "w", encoding="utf-8") as f:
+        f.write("".join(f"file {_concat_quote(audio_path)}\n" for audio_path in audio_paths))
+
+
+def _atempo_filter(speed_factor):
+    """Builds an atempo filter chain for the speed factor; each atempo instance only takes 0.5-2.0, so larger changes are chained."""
+    filters = []
+    while speed_factor > 2.0:
+        filters.append("atempo=2.0")
+        speed_factor /= 2.0
+    while speed_factor < 0.5:
+        filters.append("atempo=0.5")
+        speed_factor /= 0.5
+    filters.append(f"atempo={speed_factor:.6g}")
+    return ",".join(filters)
+
+
+def probe_duration(path):
+    """
+    Returns a media file's duration in seconds, read from its header without decoding it.
+    Results are cached per (path, mtime, size), so a segment measured for the length budget is not probed again.
+    """
+    stat = os.stat(path)
+    cache_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    duration = _DURATION_CACHE.get(cache_key)
+    if duration is None:
+        if FFPROBE_BINARY:
+            duration = float(subprocess.check_output([FFPROBE_BINARY, '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', path]))
+        else:
+            # ffprobe가 없으면 (imageio-ffmpeg는 ffmpeg만 포함) moviepy와 같은 방식으로 ffmpeg -i 헤더 출력에서 읽음
+            duration = ffmpeg_parse_infos(path)['duration']
+        _DURATION_CACHE[cache_key] = duration
+    return duration
+
+# 식별자별로 오디오 세그먼트 정렬 함수 정의 (예: 'title_1', 'body_1', 'comment1_1', ...)
+def sort_audio_segments(item):
+    identifier, filepath = item
+    filename = os.path.basename(filepath)
+    if filename.startswith('title_'): return (0, 0)
+    if filename.startswith('body_'): return (1, 0)
+    comment_match = _COMMENT_SEGMENT_RE.match(filename)
+    if comment_match:
+        return (2 + int(comment_match.group(1)), int(comment_match.group(2)))
+    comment_simple_match = _COMMENT_SIMPLE_RE.match(filename)
+    if comment_simple_match:
+        return (2 + int(comment_simple_match.group(1)), 0)
+    return (999, 0)
+
+
+_worker_image_generator = None
+_worker_tts_generator = None
+
+
+def _init_post_worker(image_base_dir, config_path, config):
+    """프로세스 풀 초기화: 워커마다 ContentImageGenerator와 TTSGenerator를 한 번만 생성 (폰트/설정 캐시 유지)"""
+    global _worker_image_generator, _worker_tts_generator
+    from src.content.generator import ContentImageGenerator
+    from src.content.tts.generator import TTSGenerator
+    image_settings = config.get('content_generation', {}).get('image', {})
+    _worker_image_generator = ContentImageGenerator(output_dir=image_base_dir,
+                                                    use_disk_cache=image_settings.get('disk_cache', False),
+                                                    cache_dir=image_settings.get('cache_dir'))
+    _worker_tts_generator = TTSGenerator(config_path=config_path, config=config)
+
+
+def process_post(post_index, post_data, data_filename, config, dirs, threads=2, tts_workers=4):
+    """
+    게시물 하나의 이미지, 오디오, 영상을 생성 (워커 프로세스에서 실행)
+    게시물끼리는 공유하는 상태가 없으므로 게시물 단위로 여러 프로세스에서 병렬 처리합니다.
+
+    Args:
+        dirs (tuple[str, str, str]): (이미지, 오디오, 영상) 기본 출력 디렉토리
+        threads (int): 이 게시물의 FFmpeg 인코딩 스레드 수
+        tts_workers (int): 이 게시물에서 동시에 보낼 TTS 요청 수 (content.tts.workers를 게시물 워커 수로 나눈 값)
+
+    Returns:
+        tuple[bool, bool]: (게시물 처리 여부, 영상 생성 여부)
+    """
+    from src.content.generator import ContentImageGenerator, IMAGE_EXT # 워커는 부모 프로세스의 sys.path를 그대로 사용
+    video_generated = False
+
+    post_id = post_data.get("id")
+    if not post_id:
+        logger.warning(f"게시물 ID가 없는 게시물 (인덱스 {post_index}, 파일 {data_filename})을 건너뜁니다.")
+        return False, False
+
+    logger.info(f"\n게시물 처리 중 - 인덱스: {post_index}, ID: {post_id} (파일: {data_filename})")
+    image_generator = _worker_image_generator
+    tts_generator = _worker_tts_generator
+
+    # 이 특정 게시물에 대한 출력 디렉토리 정의
+    image_base_dir, audio_base_dir, video_base_dir = dirs
+    current_post_image_output_dir = os.path.join(image_base_dir, post_id)
+    post_audio_output_dir = os.path.join(audio_base_dir, post_id)
+    post_video_output_dir = os.path.join(video_base_dir, post_id)
+
+    os.makedirs(current_post_image_output_dir, exist_ok=True)
+    os.makedirs(post_audio_output_dir, exist_ok=True)
+    os.makedirs(post_video_output_dir, exist_ok=True)
+
+    # 워커 프로세스마다 자신의 ContentImageGenerator를 가지므로 출력 디렉토리를 바꿔도 다른 게시물에 영향 없음
+    image_generator.set_output_dir(current_post_image_output_dir) # 이 게시물에 대한 출력 디렉토리 설정
+    image_generator.current_post_index = post_index # 파일 이름에 사용할 인덱스 설정
+
+    # --- 게시물 이미지 생성 ---
+    # 이 단일 게시물에 대한 이미지 생성 및 파일 목록 가져오기
+    post_image_files = [] # Initialize to an empty list
+    try:
+        # image_generator 내에서 파일 이름을 생성할 때 post_index를 사용하므로 여기서 post_data를 그대로 전달합니다.
+        post_image_files = image_generator.post_to_images(post_data) # post_data 안에는 'id', 'title', 'body', 'comments' 등 정보가 있습니다.
+        logger.info(f"게시물 {post_id} (인덱스: {post_index})에 대해 {len(post_image_files)}개의 이미지 파일을 생성했습니다.") # post_index 로깅 추가
+    except Exception as e:
+        logger.error(f"ERROR: 게시물 {post_id} (인덱스: {post_index}) 이미지 생성 중 오류 발생: {e}") # post_index 로깅 추가
+        # 이미지 생성 실패 시 해당 게시물 건너뛰기
+        logger.warning(f"WARNING: 게시물 {post_id} (인덱스: {post_index}) 이미지 생성 실패로 영상 생성을 건너뜁니다.") # post_index 로깅 추가
+        return False, False
+
+    if not post_image_files:
+        logger.warning(f"WARNING: 게시물 {post_id} (인덱스: {post_index})에 대한 이미지 파일이 생성되지 않았습니다. 영상 생성을 건너킵니다.") # post_index 로깅 추가
+        return False, False
+
+    # --- 게시물 오디오 생성 ---
+    audio_segment_map = {} # 세그먼트 식별자와 오디오 파일 경로 매핑
+    # 기존 오디오 생성 로직 재사용
+
+    # 오디오 속도 계수 설정
+    audio_speed_factor = config.get('content', {}).get('tts', {}).get('speed_factor', 1.0)
+    logger.info(f"오디오 속도 계수 적용: {audio_speed_factor}")
+
+    # H.264 인코더 (없으면 사용 가능한 하드웨어 인코더를 자동으로 선택, 'libx264'로 CPU 인코딩 강제)
+    video_encoder = config.get('video', {}).get('encoder')
+
+    # 누적 영상 길이 초기화 및 목표 길이 설정
+    target_video_duration_seconds = config.get('video', {}).get('max_duration_seconds', 60) # 설정에서 가져오기 (기본 60초)
+    current_video_duration = 0 # 누적 영상 길이
+
+    # 제목/본문/상위 댓글 음성을 한 번에 요청 (gTTS는 요청마다 HTTPS 왕복을 기다리므로 스레드로 지연을 숨김)
+    # post_to_images가 URL을 제거해 post_data에 저장해 둔 텍스트를 그대로 재사용
+    tts_jobs = [] # (식별자, 텍스트, 출력 경로)
+    title_text = image_generator.get_cleaned_text(post_data, "title")
+    if title_text:
+         tts_jobs.append(('title_1', title_text, os.path.join(post_audio_output_dir, f"title_1.mp3")))
+    body_text = image_generator.get_cleaned_text(post_data, "body")
+    if body_text:
+         tts_jobs.append(('body_1', body_text, os.path.join(post_audio_output_dir, f"body_1.mp3")))
+
+    max_comments_per_post = config.get('reddit', {}).get('max_comments_per_post', 5)
+    # 상위 N개만 필요하므로 전체 정렬 대신 heapq.nlargest 사용
+    comments_to_process = heapq.nlargest(max_comments_per_post, post_data.get('comments', []), key=lambda c: c.get('score', 0))
+    for c_idx, comment in enumerate(comments_to_process):
+        comment_author = comment.get('author', '') or '[Deleted]'
+        comment_body = comment.get('body', '') or ''
+        comment_text = ContentImageGenerator._remove_urls(f"{comment_author}: {comment_body}")
+        tts_jobs.append((f'comment{c_idx+1}_1', comment_text, os.path.join(post_audio_output_dir, f"comment{c_idx+1}_1.mp3")))
+
+    logger.info(f"제목/본문 및 상위 {len(comments_to_process)}개 댓글 오디오 생성 중...")
+    if tts_generator.uses_process_pool:
+        # 로컬 합성 엔진은 CPU를 쓰므로 게시물 단위 프로세스 풀 안에서 다시 병렬화하지 않음
+        tts_results = [tts_generator.generate_audio(text, path, already_cleaned=True) for _, text, path in tts_jobs]
+    else:
+        tts_results = tts_generator.generate_audio_batch([(text, path) for _, text, path in tts_jobs],
+                                                         max_workers=tts_workers, already_cleaned=True)
+    tts_succeeded = {identifier: ok for (identifier, _, _), ok in zip(tts_jobs, tts_results)}
+
+    for identifier, _, audio_path in tts_jobs:
+        if identifier.startswith('comment'):
+            continue
+        if tts_succeeded[identifier]:
+            audio_segment_map[identifier] = audio_path
+        else:
+            logger.warning("제목 오디오 생성 실패." if identifier == 'title_1' else "본문 오디오 생성 실패.")
+
+    if comments_to_process:
+        # 제목 및 본문 오디오 길이 합산 (이미 생성된 오디오 사용)
+        # 길이는 파일 헤더에서만 읽음 (디코더를 열지 않음)
+        for identifier in ('title_1', 'body_1'):
+            audio_path = audio_segment_map.get(identifier)
+            if audio_path and os.path.exists(audio_path):
+                current_video_duration += probe_duration(audio_path)
+
+        logger.debug(f"제목+본문 오디오 초기 길이: {current_video_duration:.2f}s")
+
+        # 댓글 음성은 미리 모두 만들어 두었으므로 점수 순서대로 목표 길이까지만 포함
+        comment_jobs = [job for job in tts_jobs if job[0].startswith('comment')]
+        for c_idx, (identifier, _, comment_audio_filepath) in enumerate(comment_jobs):
+            if not tts_succeeded[identifier]:
+                 logger.warning(f"댓글 {c_idx+1} 오디오 생성 실패. 이 댓글은 제외합니다.")
+                 continue
+
+            # 생성된 댓글 오디오 파일 로드하여 길이 확인
+            try:
+                comment_duration = probe_duration(comment_audio_filepath)
+
+                # 총 영상 길이를 초과하는지 확인
+                if current_video_duration + comment_duration <= target_video_duration_seconds:
+                    logger.info(f"댓글 {c_idx+1} 오디오 ({comment_duration:.2f}s) 포함. 누적 길이: {current_video_duration + comment_duration:.2f}s")
+                    audio_segment_map[identifier] = comment_audio_filepath # 포함 확정
+                    current_video_duration += comment_duration # 누적 길이 업데이트
+                else:
+                    logger.info(f"댓글 {c_idx+1} 오디오 ({comment_duration:.2f}s) 포함 시 총 길이 ({current_video_duration + comment_duration:.2f}s)가 {target_video_duration_seconds}s를 초과. 이 이후 댓글은 제외.")
+                    # 목표 길이 초과 시, 이 댓글과 이후 댓글의 오디오 파일 삭제 및 처리 중단
+                    for _, _, excluded_audio_filepath in comment_jobs[c_idx:]:
+                        if os.path.exists(excluded_audio_filepath):
+                            os.remove(excluded_audio_filepath)
+                            logger.debug(f"초과 길이로 인해 댓글 오디오 파일 삭제됨: {excluded_audio_filepath}")
+                    break # 댓글 순회 중단
+
+            except Exception as e:
+                logger.error(f"댓글 {c_idx+1} 오디오 파일 로드 또는 처리 오류: {e}. 이 댓글은 제외합니다.")
+                # 오류 발생 시 생성된 파일 삭제
+                if os.path.exists(comment_audio_filepath):
+                     os.remove(comment_audio_filepath)
+                     logger.debug(f"오류로 인해 댓글 오디오 파일 삭제됨: {comment_audio_filepath}")
+
+    # 댓글 오디오 처리 완료 후, 실제로 audio_segment_map에 포함된 오디오만 가지고 processed_audio_paths와 이미지/지속 시간 목록 구성
+    # 이제 audio_segment_map에 최종적으로 포함된 오디오 파일들을 바탕으로
+    # processed_audio_paths와 audio_clip_duration_map을 재구성합니다.
+
+    # audio_segment_map의 항목을 정렬 (제목, 본문, 댓글 순서)
+    final_audio_segments_items = sorted(audio_segment_map.items(), key=sort_audio_segments)
+
+    audio_clip_duration_map = {} # Store durations by identifier
+    processed_audio_paths = [] # FFmpeg로 이어 붙일 오디오 파일 (정렬 순서)
+
+    # 정렬된 최종 오디오 세그먼트의 길이를 헤더에서 읽고, 속도 계수 적용 후 길이를 계산해 저장
+    # 실제 속도 변경은 이어 붙인 오디오에 atempo로 한 번만 적용하므로 여기서 오디오를 디코딩하지 않음
+    for identifier, audio_path in final_audio_segments_items:
+         if os.path.exists(audio_path):
+             try:
+                 original_duration = probe_duration(audio_path)
+                 adjusted_duration = original_duration / audio_speed_factor
+                 logger.debug(f"오디오 세그먼트 - 식별자: {identifier}, 원본 지속 시간: {original_duration:.2f}s, 속도 계수 {audio_speed_factor} 적용 후: {adjusted_duration:.2f}s (파일: {audio_path})")
+
+                 processed_audio_paths.append(audio_path)
+                 # 속도 조정 후 지속 시간을 오디오 클립 지속 시간 맵에 저장
+                 audio_clip_duration_map[identifier] = adjusted_duration # Store duration by identifier
+
+             except Exception as e:
+                 logger.error(f"오디오 클립 처리 오류 - 파일 {audio_path}, 식별자 {identifier}: {e}")
+         else:
+              logger.warning(f"오디오 파일을 찾을 수 없습니다 - 경로 {audio_path}, 식별자 {identifier}.")
+
+    # 이미지 지속 시간 목록을 오디오 순서에 맞춰 구성
+    # 이미지 경로와 지속 시간을 같은 인덱스의 두 리스트로 바로 쌓음 (나중에 튜플 목록을 다시 풀지 않음)
+    images_in_order = []
+    durations_in_order = []
+
+    # 1. 제목 이미지 추가 (title_1 오디오에 매핑)
+    title_audio_identifier = 'title_1'
+    # Find the main post image (title/body combined)
+    # Filename format is post_[post_idx]_[post_id].jpg
+    # post_index는 enumerate 루프 변수 사용
+    # post_id는 post_data.get("id", "unknown") 사용
+    main_post_image_pattern = f"post_{post_index}_{post_id}{IMAGE_EXT}" # Use the loop variable post_index
+
+    # 이미지 목록을 한 번만 훑어 메인 이미지와 댓글별 파트 이미지 인덱스를 만듦 (세그먼트마다 전체 목록을 다시 검색하지 않음)
+    main_post_images = []
+    comment_image_index = {} # 0-based comment index -> [(part index, image path), ...]
+    for img_path in post_image_files:
+        filename = os.path.basename(img_path)
+        if filename == main_post_image_pattern:
+            main_post_images.append(img_path)
+            continue
+        part_match = _COMMENT_PART_IMAGE_RE.search(filename)
+        if part_match and part_match.group(3) == IMAGE_EXT:
+            comment_image_index.setdefault(int(part_match.group(1)), []).append((int(part_match.group(2)), img_path))
+
+    # For title and body, use the main post image if found
+    title_matching_images = main_post_images
+
+    logger.debug(f"오디오 세그먼트 {title_audio_identifier}에 대해 찾은 매칭 이미지: {title_matching_images}")
+    if title_matching_images:
+        total_audio_duration_for_segment = audio_clip_duration_map.get(title_audio_identifier, 0)
+        num_matching_images = len(title_matching_images)
+        duration_per_image = total_audio_duration_for_segment / num_matching_images if num_matching_images > 0 else 0
+        for img_path in title_matching_images:
+            images_in_order.append(img_path)
+            durations_in_order.append(duration_per_image)
+            logger.debug(f"이미지 {os.path.basename(img_path)}를 오디오 {title_audio_identifier}에 매핑 - 초기 지속 시간: {duration_per_image:.2f}s")
+    else:
+        logger.warning(f"게시물 {post_id}의 오디오 세그먼트 {title_audio_identifier}에 해당하는 이미지를 찾지 못했습니다. 이 오디오 세그먼트에는 이미지가 표시되지 않습니다.")
+
+    # 2. 본문 이미지 추가 (body_1 오디오에 매핑)
+    body_audio_identifier = 'body_1'
+    # For body, also use the main post image if found
+    body_matching_images = main_post_images # Use the same main image as for title
+
+    logger.debug(f"오디오 세그먼트 {body_audio_identifier}에 대해 찾은 매칭 이미지: {body_matching_images}")
+    if body_matching_images:
+        total_audio_duration_for_segment = audio_clip_duration_map.get(body_audio_identifier, 0)
+        num_matching_images = len(body_matching_images)
+        duration_per_image = total_audio_duration_for_segment / num_matching_images if num_matching_images > 0 else 0
+        for img_path in body_matching_images:
+            images_in_order.append(img_path)
+            durations_in_order.append(duration_per_image)
+            logger.debug(f"이미지 {os.path.basename(img_path)}를 오디오 {body_audio_identifier}에 매핑 - 초기 지속 시간: {duration_per_image:.2f}s")
+    else:
+        logger.warning(f"게시물 {post_id}의 오디오 세그먼트 {body_audio_identifier}에 해당하는 이미지를 찾지 못했습니다. 이 오디오 세그먼트에는 이미지가 표시되지 않습니다.")
+
+    # 3. 댓글 이미지 추가 (commentX_Y 오디오에 매핑)
+    # 오디오 세그먼트 목록에서 title_1, body_1을 제외하고 댓글 오디오만 처리
+    comment_audio_segments = [item for item in final_audio_segments_items if item[0].startswith('comment')]
+
+    for identifier, _ in comment_audio_segments:
+         # 이 오디오 세그먼트에 해당하는 이미지 찾기
+         comment_match = _COMMENT_SEGMENT_RE.match(identifier)
+         matching_images = [] # Reset matching_images for each comment segment
+         if comment_match:
+              comment_display_idx = int(comment_match.group(1))
+              audio_part_idx = int(comment_match.group(2)) # Part index from audio identifier (usually 1)
+
+              # All image parts for this comment, sorted by their part index to ensure correct sequence
+              # Note: Image generator uses 0-based index for comment, audio uses 1-based display index
+              comment_parts = comment_image_index.get(comment_display_idx - 1, [])
+              matching_images = [img_path for _, img_path in sorted(comment_parts, key=lambda part: part[0])]
+
+         # 디버그: 현재 오디오 세그먼트에 대해 찾은 이미지 목록 확인
+         logger.debug(f"오디오 세그먼트 {identifier}에 대해 찾은 매칭 이미지: {matching_images}")
+
+         if matching_images:
+              # Each matching image part will be displayed for the duration of the corresponding audio segment
+              # If there are multiple image parts for one audio segment, the audio duration is split equally
+               total_audio_duration_for_segment = audio_clip_duration_map.get(identifier, 0)
+               num_matching_images = len(matching_images)
+               duration_per_image = total_audio_duration_for_segment / num_matching_images if num_matching_images > 0 else 0
+
+               for img_path in matching_images:
+                   images_in_order.append(img_path)
+                   durations_in_order.append(duration_per_image)
+                   logger.debug(f"이미지 {os.path.basename(img_path)}를 오디오 {identifier}에 매핑 - 초기 지속 시간: {duration_per_image:.2f}s")
+         else:
+              logger.warning(f"게시물 {post_id}의 오디오 세그먼트 {identifier}에 해당하는 이미지를 찾지 못했습니다. 이 오디오 세그먼트에는 이미지가 표시되지 않습니다.")
+
+    # 모든 이미지 추가 후 총 오디오 길이에 맞춰 마지막 이미지 지속 시간 조정
+    if processed_audio_paths:
+        # 원본 오디오는 영상 인코딩 FFmpeg 명령이 concat 입력으로 직접 이어 붙이고 속도 계수도 적용하므로
+        # 이어 붙인 중간 오디오 파일을 따로 인코딩하지 않음. 총 길이는 세그먼트별 (속도 적용 후) 길이의 합
+        total_audio_duration = sum(audio_clip_duration_map.values())
+        total_image_initial_duration = sum(durations_in_order)
+
+        # 길이 차이 계산
+        duration_difference = total_audio_duration - total_image_initial_duration
+
+        # 마지막 이미지 지속 시간 조정
+        if durations_in_order:
+            original_last_duration = durations_in_order[-1]
+            adjusted_last_duration = max(0.01, original_last_duration + duration_difference) # Ensure duration is not zero or negative
+            durations_in_order[-1] = adjusted_last_duration
+            logger.debug(f"마지막 이미지 지속 시간 조정: {original_last_duration:.2f}s -> {adjusted_last_duration:.2f}s. 총 영상 길이 차이: {duration_difference:.2f}s")
+
+        # 특정 지속 시간을 가진 이미지 시퀀스 클립 생성 (조정된 지속 시간 사용)
+        if not images_in_order:
+            logger.error(f"게시물 {post_id}에 대한 이미지 목록이 비어 있습니다. 영상 생성 불가.")
+        else:
+             logger.info(f"게시물 {post_id}에 대해 {len(images_in_order)}개의 이미지로 영상 생성 중. 총 지속 시간: {sum(durations_in_order):.2f}s")
+
+             # 이 게시물에 대한 VideoGenerator.generate_video 메소드 호출
+             video_filename_base = post_id # 이 게시물에 대한 파일 이름 기본
+
+             # 이 게시물의 출력 디렉토리에 대한 VideoGenerator 초기화
+             video_gen_for_post = VideoGenerator(output_dir=post_video_output_dir, encoder=video_encoder)
+             # generate_video 호출 시 조정된 지속 시간 사용
+             # 영상 생성 중 발생할 수 있는 예외 처리를 위해 try...except 블록 사용
+             try:
+                 generated_video_path = video_gen_for_post.generate_video(list(zip(images_in_order, durations_in_order)), processed_audio_paths, video_filename_base, threads=threads,
+                                                                       audio_speed_factor=audio_speed_factor) # 파일 이름 기본 전달
+
+                 if generated_video_path:
+                     logger.info(f"게시물 {post_id}에 대한 영상 생성 성공: {generated_video_path}")
+                     video_generated = True
+                 else:
+                     logger.error(f"게시물 {post_id}에 대한 영상 생성 실패.")
+
+             except Exception as e:
+                 logger.error(f"게시물 {post_id} 영상 생성 중 오류 발생: {e}")
+
+    # 처리된 오디오 클립이 없는 경우 (이전 로직 유지)
+    else:
+        logger.warning(f"게시물 {post_id}에 대한 처리된 오디오 클립이 없습니다. 영상에 오디오를 추가할 수 없습니다.")
+        # 오디오 없이 영상 생성 또는 건너뛰기 (선택 사항)
+        # 오디오가 있을 때와 같은 generate_video(FFmpeg concat) 경로로, 오디오 입력만 빼고 생성
+        if images_in_order:
+             logger.info(f"게시물 {post_id}에 대한 오디오 없는 영상 생성 중...")
+             video_gen_for_post = VideoGenerator(output_dir=post_video_output_dir, encoder=video_encoder) # 이 게시물의 출력 디렉토리에 대한 초기화
+             video_filename_base = f"{post_id}_shorts_no_audio"
+             generated_video_path = video_gen_for_post.generate_video(list(zip(images_in_order, durations_in_order)), None, video_filename_base, threads=threads) # audio_clip에 None 전달
+
+             if generated_video_path:
+                 logger.warning(f"게시물 {post_id}에 대한 오디오 없는 영상 생성 완료: {generated_video_path}")
+             else:
+                  logger.error(f"게시물 {post_id}에 대한 오디오 없는 영상 생성 실패.")
+        else:
+            logger.warning(f"게시물 {post_id}에 대한 이미지 또는 지속 시간 누락으로 오디오 없는 영상 생성을 건너뜁니다.")
+
+    return True, video_generated
+
 
 # Example usage (will be removed or updated later)
 if __name__ == "__main__":
@@ -176,26 +706,12 @@ if __name__ == "__main__":
     # ContentImageGenerator와 TTSGenerator는 이미지/오디오 생성을 위해 필요합니다.
     try:
         # 프로젝트 구조에 따라 import 경로를 조정해야 할 수 있습니다.
-        from src.content.generator import ContentImageGenerator
+        from src.content.generator import ContentImageGenerator, IMAGE_EXT
         from src.content.tts.generator import TTSGenerator
     except ImportError as e:
         logger.error(f"__main__ 블록에서 ContentImageGenerator 또는 TTSGenerator 임포트 실패: {e}. src 디렉토리가 sys.path에 있는지 확인하거나 import 경로를 조정하세요.")
         exit(1) # 필수 모듈 임포트 실패 시 종료
 
-    # 식별자별로 오디오 세그먼트 정렬 함수 정의 (예: 'title_1', 'body_1', 'comment1_1', ...)
-    def sort_audio_segments(item):
-        identifier, filepath = item
-        filename = os.path.basename(filepath)
-        if filename.startswith('title_'): return (0, 0)
-        if filename.startswith('body_'): return (1, 0)
-        comment_match = re.match(r'comment(\d+)_(\d+)', filename)
-        if comment_match:
-            return (2 + int(comment_match.group(1)), int(comment_match.group(2)))
-        comment_simple_match = re.match(r'comment(\d+)', filename)
-        if comment_simple_match:
-            return (2 + int(comment_simple_match.group(1)), 0)
-        return (999, 0)
-
     def load_config(config_path="config/config.yaml"):
         """Load configuration from YAML file."""
         try:
@@ -231,27 +747,34 @@ if __name__ == "__main__":
 
     total_posts_processed = 0
     total_videos_generated = 0
-    # VideoGenerator 인스턴스는 각 게시물별 하위 디렉토리에 저장하도록 루프 안에서 초기화합니다.
+    # VideoGenerator 인스턴스는 각 게시물별 하위 디렉토리에 저장하도록 process_post 안에서 초기화합니다.
     # video_generator_base = VideoGenerator(output_dir=video_base_dir)
+    dirs = (image_base_dir, audio_base_dir, video_base_dir)
+
+    # 게시물 단위 병렬 처리: 코어 절반만큼 워커를 두고 각 FFmpeg는 2스레드로 인코딩
+    # 워커마다 ContentImageGenerator/TTSGenerator가 하나씩 있으므로 output_dir을 서로 공유하지 않습니다.
+    post_workers = max(1, (os.cpu_count() or 1) // 2)
+    # 전체 동시 TTS 요청 수(content.tts.workers)를 게시물 워커끼리 나눠 rate limit을 넘지 않도록 함
+    tts_workers = max(1, config.get('content', {}).get('tts', {}).get('workers', 8) // post_workers)
+    executor = ProcessPoolExecutor(max_workers=post_workers, initializer=_init_post_worker,
+                                   initargs=(image_base_dir, "config/config.yaml", config))
+    post_futures = []
 
     # --- 최신 데이터 파일 목록을 순회합니다 ---
     for data_filepath in latest_data_files:
         logger.info(f"\n데이터 파일 처리 중: {os.path.basename(data_filepath)}")
 
-        # 현재 파일에서 데이터 로드
+        # 현재 파일에서 데이터 로드 (ContentImageGenerator와 같은 로더로 리스트/'posts' 딕셔너리 형식을 판별)
         try:
-            with open(data_filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(data_filepath, "rb") as f:
+                posts = ContentImageGenerator.iter_posts(f)
+                if posts is not None:
+                    posts = list(posts)
         except Exception as e:
             logger.error(f"JSON 파일 로드 오류 {data_filepath}: {e}. 이 파일을 건너뜁니다.")
             continue # 다음 파일로 이동
 
-        posts = []
-        if isinstance(data, list):
-            posts = data
-        elif isinstance(data, dict) and "posts" in data and isinstance(data["posts"], list):
-            posts = data["posts"]
-        else:
+        if posts is None:
             logger.error(f"예상치 못한 데이터 형식입니다 {data_filepath}. 리스트 또는 'posts' 키를 가진 딕셔너리(리스트 포함)가 필요합니다. 이 파일을 건너뜁니다.")
             continue # 다음 파일로 이동
 
@@ -261,325 +784,23 @@ if __name__ == "__main__":
 
         logger.info(f"{os.path.basename(data_filepath)}에서 {len(posts)}개의 게시물을 찾았습니다.")
 
-        # 게시물 처리를 위한 ContentImageGenerator 및 TTSGenerator 초기화
-        image_generator = ContentImageGenerator(output_dir=image_base_dir) # 이미지 저장 기본 디렉토리, 게시물별 하위 디렉토리는 나중에 설정
-        tts_generator = TTSGenerator(config_path="config/config.yaml")
-
-        # --- 현재 데이터 파일 내의 각 게시물을 순회합니다 ---
-        for post_index, post_data in enumerate(posts):
-            post_id = post_data.get("id")
-            if not post_id:
-                logger.warning(f"게시물 ID가 없는 게시물 (인덱스 {post_index}, 파일 {os.path.basename(data_filepath)})을 건너뜁니다.")
-                continue
-
-            logger.info(f"\n게시물 처리 중 - 인덱스: {post_index}, ID: {post_id} (파일: {os.path.basename(data_filepath)})")
-            total_posts_processed += 1
-
-            # 이 특정 게시물에 대한 출력 디렉토리 정의
-            current_post_image_output_dir = os.path.join(image_base_dir, post_id)
-            post_audio_output_dir = os.path.join(audio_base_dir, post_id)
-            post_video_output_dir = os.path.join(video_base_dir, post_id)
+        # --- 현재 데이터 파일 내의 각 게시물을 워커 프로세스에 나눠 처리합니다 ---
+        post_futures.extend(
+            executor.submit(process_post, post_index, post_data, os.path.basename(data_filepath), config, dirs,
+                            tts_workers=tts_workers)
+            for post_index, post_data in enumerate(posts)
+        )
 
-            os.makedirs(current_post_image_output_dir, exist_ok=True)
-            os.makedirs(post_audio_output_dir, exist_ok=True)
-            os.makedirs(post_video_output_dir, exist_ok=True)
-
-            # 게시물 처리를 위한 ContentImageGenerator 및 TTSGenerator 인스턴스 설정 (루프 안에서)
-            image_generator.output_dir = current_post_image_output_dir # 이 게시물에 대한 출력 디렉토리 설정
-            image_generator.current_post_index = post_index # 파일 이름에 사용할 인덱스 설정
-
-            # --- 게시물 이미지 생성 ---
-            # 이 단일 게시물에 대한 이미지 생성 및 파일 목록 가져오기
-            post_image_files = [] # Initialize to an empty list
+    # --- 모든 게시물 작업 완료 대기 ---
+    with executor:
+        for future in post_futures:
             try:
-                # image_generator 내에서 파일 이름을 생성할 때 post_index를 사용하므로 여기서 post_data를 그대로 전달합니다.
-                post_image_files = image_generator.post_to_images(post_data) # post_data 안에는 'id', 'title', 'body', 'comments' 등 정보가 있습니다.
-                logger.info(f"게시물 {post_id} (인덱스: {post_index})에 대해 {len(post_image_files)}개의 이미지 파일을 생성했습니다.") # post_index 로깅 추가
+                post_processed, video_generated = future.result()
             except Exception as e:
-                logger.error(f"ERROR: 게시물 {post_id} (인덱스: {post_index}) 이미지 생성 중 오류 발생: {e}") # post_index 로깅 추가
-                # 이미지 생성 실패 시 해당 게시물 건너뛰기
-                logger.warning(f"WARNING: 게시물 {post_id} (인덱스: {post_index}) 이미지 생성 실패로 영상 생성을 건너뜁니다.") # post_index 로깅 추가
-                total_posts_processed -= 1 # Subtract if we incremented earlier
-                continue # 다음 게시물로 이동
-
-            if not post_image_files:
-                logger.warning(f"WARNING: 게시물 {post_id} (인덱스: {post_index})에 대한 이미지 파일이 생성되지 않았습니다. 영상 생성을 건너킵니다.") # post_index 로깅 추가
-                total_posts_processed -= 1 # Subtract if we incremented earlier
-                continue # 다음 게시물로 이동
-
-            # --- 게시물 오디오 생성 ---
-            audio_segment_map = {} # 세그먼트 식별자와 오디오 파일 경로 매핑
-            # 기존 오디오 생성 로직 재사용
-
-            # 오디오 속도 계수 설정
-            audio_speed_factor = config.get('content', {}).get('tts', {}).get('speed_factor', 1.0)
-            logger.info(f"오디오 속도 계수 적용: {audio_speed_factor}")
-
-            # 누적 영상 길이 초기화 및 목표 길이 설정
-            target_video_duration_seconds = config.get('video', {}).get('max_duration_seconds', 60) # 설정에서 가져오기 (기본 60초)
-            current_video_duration = 0 # 누적 영상 길이
-
-            # 제목 오디오 생성
-            title_text = post_data.get("title", "")
-            if title_text:
-                 title_audio_filepath = os.path.join(post_audio_output_dir, f"title_1.mp3")
-                 logger.info(f"제목 오디오 생성 중...")
-                 if tts_generator.generate_audio(title_text, title_audio_filepath):
-                     audio_segment_map['title_1'] = title_audio_filepath
-                 else:
-                     logger.warning("제목 오디오 생성 실패.")
-
-            # 본문 오디오 생성
-            body_text = post_data.get("body", "")
-            if body_text:
-                 body_audio_filepath = os.path.join(post_audio_output_dir, f"body_1.mp3")
-                 logger.info(f"본문 오디오 생성 중...")
-                 if tts_generator.generate_audio(body_text, body_audio_filepath):
-                     audio_segment_map['body_1'] = body_audio_filepath
-                 else:
-                     logger.warning("본문 오디오 생성 실패.")
-
-            # 댓글 오디오 생성
-            sorted_comments = sorted(post_data.get('comments', []), key=lambda c: c.get('score', 0), reverse=True)
-            max_comments_per_post = config.get('reddit', {}).get('max_comments_per_post', 5)
-            comments_to_process = sorted_comments[:max_comments_per_post]
-
-            if comments_to_process:
-                logger.info(f"상위 {len(comments_to_process)}개 댓글 오디오 생성 중...")
-                
-                # 제목 및 본문 오디오 길이 합산 (이미 생성된 오디오 사용)
-                title_audio = AudioFileClip(audio_segment_map.get('title_1', '')) if audio_segment_map.get('title_1') and os.path.exists(audio_segment_map.get('title_1', '')) else None
-                body_audio = AudioFileClip(audio_segment_map.get('body_1', '')) if audio_segment_map.get('body_1') and os.path.exists(audio_segment_map.get('body_1', '')) else None
-                
-                if title_audio: current_video_duration += title_audio.duration
-                if body_audio: current_video_duration += body_audio.duration
-                
-                logger.debug(f"제목+본문 오디오 초기 길이: {current_video_duration:.2f}s")
-
-                for c_idx, comment in enumerate(comments_to_process):
-                    comment_author = comment.get('author', '') or '[Deleted]'
-                    comment_body = comment.get('body', '') or ''
-                    comment_text = f"{comment_author}: {comment_body}"
-                    comment_audio_filepath = os.path.join(post_audio_output_dir, f"comment{c_idx+1}_1.mp3")
-
-                    # 댓글 오디오 생성 시도
-                    if tts_generator.generate_audio(comment_text, comment_audio_filepath):
-                        # 생성된 댓글 오디오 파일 로드하여 길이 확인
-                        try:
-                            comment_audio_clip = AudioFileClip(comment_audio_filepath)
-                            comment_duration = comment_audio_clip.duration
-                            
-                            # 총 영상 길이를 초과하는지 확인
-                            if current_video_duration + comment_duration <= target_video_duration_seconds:
-                                logger.info(f"댓글 {c_idx+1} 오디오 ({comment_duration:.2f}s) 포함. 누적 길이: {current_video_duration + comment_duration:.2f}s")
-                                audio_segment_map[f'comment{c_idx+1}_1'] = comment_audio_filepath # 포함 확정
-                                current_video_duration += comment_duration # 누적 길이 업데이트
-                            else:
-                                logger.info(f"댓글 {c_idx+1} 오디오 ({comment_duration:.2f}s) 포함 시 총 길이 ({current_video_duration + comment_duration:.2f}s)가 {target_video_duration_seconds}s를 초과. 이 이후 댓글은 제외.")
-                                # 목표 길이 초과 시, 생성된 오디오 파일 삭제 및 이후 댓글 처리 중단
-                                if os.path.exists(comment_audio_filepath):
-                                    os.remove(comment_audio_filepath)
-                                    logger.debug(f"초과 길이로 인해 댓글 오디오 파일 삭제됨: {comment_audio_filepath}")
-                                break # 댓글 순회 중단
-                                
-                        except Exception as e:
-                            logger.error(f"댓글 {c_idx+1} 오디오 파일 로드 또는 처리 오류: {e}. 이 댓글은 제외합니다.")
-                            # 오류 발생 시 생성된 파일 삭제
-                            if os.path.exists(comment_audio_filepath):
-                                 os.remove(comment_audio_filepath)
-                                 logger.debug(f"오류로 인해 댓글 오디오 파일 삭제됨: {comment_audio_filepath}")
-                                
-                    else:
-                         logger.warning(f"댓글 {c_idx+1} 오디오 생성 실패. 이 댓글은 제외합니다.")
-
-            # 댓글 오디오 처리 완료 후, 실제로 audio_segment_map에 포함된 오디오만 가지고 processed_audio_clips와 image_duration_list_final 구성
-            # 이제 audio_segment_map에 최종적으로 포함된 오디오 파일들을 바탕으로
-            # processed_audio_clips와 audio_clip_duration_map을 재구성합니다.
-            
-            # audio_segment_map의 항목을 정렬 (제목, 본문, 댓글 순서)
-            final_audio_segments_items = sorted(audio_segment_map.items(), key=sort_audio_segments)
-
-            audio_clip_duration_map = {} # Store durations by identifier
-            processed_audio_clips = [] # processed audio clips list
-
-            # 정렬된 최종 오디오 세그먼트 로드, 속도 계수 적용, 지속 시간 저장 및 리스트 추가
-            for identifier, audio_path in final_audio_segments_items:
-                 if os.path.exists(audio_path):
-                     try:
-                         clip = AudioFileClip(audio_path)
-                         logger.debug(f"오디오 클립 로드 - 식별자: {identifier}, 원본 지속 시간: {clip.duration:.2f}s (파일: {audio_path})")
-
-                         if audio_speed_factor != 1.0:
-                             speed_adjusted_clip = clip.fx(vfx.speedx, factor=audio_speed_factor)
-                             logger.debug(f"속도 계수 {audio_speed_factor} 적용 - 식별자: {identifier}. 새 지속 시간: {speed_adjusted_clip.duration:.2f}s")
-                         else:
-                             speed_adjusted_clip = clip
-
-                         # Add the processed clip to the list
-                         processed_audio_clips.append(speed_adjusted_clip)
-
-                         # 속도 조정된 클립의 지속 시간을 오디오 클립 지속 시간 맵에 저장
-                         audio_clip_duration_map[identifier] = speed_adjusted_clip.duration # Store duration by identifier
-
-                     except Exception as e:
-                         logger.error(f"오디오 클립 처리 오류 - 파일 {audio_path}, 식별자 {identifier}: {e}")
-                 else:
-                      logger.warning(f"오디오 파일을 찾을 수 없습니다 - 경로 {audio_path}, 식별자 {identifier}.")
-
-            # 이미지 지속 시간 목록을 오디오 순서에 맞춰 구성
-            image_duration_list_final = []
-            current_images = [] # 이미지 순서 기록 (디버그용 또는 이후 활용)
-
-            # 1. 제목 이미지 추가 (title_1 오디오에 매핑)
-            title_audio_identifier = 'title_1'
-            # Find the main post image (title/body combined)
-            # Filename format is post_[post_idx]_[post_id].png
-            # post_index는 enumerate 루프 변수 사용
-            # post_id는 post_data.get("id", "unknown") 사용
-            main_post_image_pattern = f"post_{post_index}_{post_id}.png" # Use the loop variable post_index
-            main_post_images = [img_path for img_path in post_image_files if os.path.basename(img_path) == main_post_image_pattern]
-
-            # For title and body, use the main post image if found
-            title_matching_images = main_post_images
-
-            logger.debug(f"오디오 세그먼트 {title_audio_identifier}에 대해 찾은 매칭 이미지: {title_matching_images}")
-            if title_matching_images:
-                total_audio_duration_for_segment = audio_clip_duration_map.get(title_audio_identifier, 0)
-                num_matching_images = len(title_matching_images)
-                duration_per_image = total_audio_duration_for_segment / num_matching_images if num_matching_images > 0 else 0
-                for img_path in title_matching_images:
-                    image_duration_list_final.append((img_path, duration_per_image))
-                    current_images.append(img_path)
-                    logger.debug(f"이미지 {os.path.basename(img_path)}를 오디오 {title_audio_identifier}에 매핑 - 초기 지속 시간: {duration_per_image:.2f}s")
-            else:
-                logger.warning(f"게시물 {post_id}의 오디오 세그먼트 {title_audio_identifier}에 해당하는 이미지를 찾지 못했습니다. 이 오디오 세그먼트에는 이미지가 표시되지 않습니다.")
-
-            # 2. 본문 이미지 추가 (body_1 오디오에 매핑)
-            body_audio_identifier = 'body_1'
-            # For body, also use the main post image if found
-            body_matching_images = main_post_images # Use the same main image as for title
-
-            logger.debug(f"오디오 세그먼트 {body_audio_identifier}에 대해 찾은 매칭 이미지: {body_matching_images}")
-            if body_matching_images:
-                total_audio_duration_for_segment = audio_clip_duration_map.get(body_audio_identifier, 0)
-                num_matching_images = len(body_matching_images)
-                duration_per_image = total_audio_duration_for_segment / num_matching_images if num_matching_images > 0 else 0
-                for img_path in body_matching_images:
-                    image_duration_list_final.append((img_path, duration_per_image))
-                    current_images.append(img_path)
-                    logger.debug(f"이미지 {os.path.basename(img_path)}를 오디오 {body_audio_identifier}에 매핑 - 초기 지속 시간: {duration_per_image:.2f}s")
-            else:
-                logger.warning(f"게시물 {post_id}의 오디오 세그먼트 {body_audio_identifier}에 해당하는 이미지를 찾지 못했습니다. 이 오디오 세그먼트에는 이미지가 표시되지 않습니다.")
-
-            # 3. 댓글 이미지 추가 (commentX_Y 오디오에 매핑)
-            # 오디오 세그먼트 목록에서 title_1, body_1을 제외하고 댓글 오디오만 처리
-            comment_audio_segments = [item for item in final_audio_segments_items if item[0].startswith('comment')]
-
-            for identifier, _ in comment_audio_segments:
-                 # 이 오디오 세그먼트에 해당하는 이미지 찾기
-                 comment_match = re.match(r'comment(\d+)_(\d+)', identifier)
-                 matching_images = [] # Reset matching_images for each comment segment
-                 if comment_match:
-                      comment_display_idx = int(comment_match.group(1))
-                      audio_part_idx = int(comment_match.group(2)) # Part index from audio identifier (usually 1)
-
-                      # Find all image parts for this comment
-                      # Search for filenames containing `comment_{comment_display_idx-1}_part_` and ending with `.png`
-                      # Note: Image generator uses 0-based index for comment, audio uses 1-based display index
-                      comment_image_base_pattern = f"comment_{comment_display_idx-1}_part_" # Use comment_display_idx-1 for 0-based image index
-                      all_comment_parts = [img_path for img_path in post_image_files if comment_image_base_pattern in os.path.basename(img_path) and os.path.basename(img_path).endswith('.png')]
-
-                      # Sort the image parts by their part index to ensure correct sequence
-                      def sort_image_parts(img_path):
-                          filename = os.path.basename(img_path)
-                          match = re.search(r'_part_(\d+)\.png', filename)
-                          return int(match.group(1)) if match else 0
-
-                      matching_images = sorted(all_comment_parts, key=sort_image_parts)
-
-                 # 디버그: 현재 오디오 세그먼트에 대해 찾은 이미지 목록 확인
-                 logger.debug(f"오디오 세그먼트 {identifier}에 대해 찾은 매칭 이미지: {matching_images}")
-
-                 if matching_images:
-                      # Each matching image part will be displayed for the duration of the corresponding audio segment
-                      # If there are multiple image parts for one audio segment, the audio duration is split equally
-                       total_audio_duration_for_segment = audio_clip_duration_map.get(identifier, 0)
-                       num_matching_images = len(matching_images)
-                       duration_per_image = total_audio_duration_for_segment / num_matching_images if num_matching_images > 0 else 0
-
-                       for img_path in matching_images:
-                           image_duration_list_final.append((img_path, duration_per_image))
-                           current_images.append(img_path)
-                           logger.debug(f"이미지 {os.path.basename(img_path)}를 오디오 {identifier}에 매핑 - 초기 지속 시간: {duration_per_image:.2f}s")
-                 else:
-                      logger.warning(f"게시물 {post_id}의 오디오 세그먼트 {identifier}에 해당하는 이미지를 찾지 못했습니다. 이 오디오 세그먼트에는 이미지가 표시되지 않습니다.")
-
-            # 모든 이미지 추가 후 총 오디오 길이에 맞춰 마지막 이미지 지속 시간 조정
-            if processed_audio_clips:
-                final_audio_clip = concatenate_audioclips(processed_audio_clips)
-                total_audio_duration = final_audio_clip.duration
-                total_image_initial_duration = sum([dur for img, dur in image_duration_list_final])
-
-                # 길이 차이 계산
-                duration_difference = total_audio_duration - total_image_initial_duration
-
-                # 마지막 이미지 지속 시간 조정
-                if image_duration_list_final:
-                    last_image_index = len(image_duration_list_final) - 1
-                    original_last_duration = image_duration_list_final[last_image_index][1]
-                    adjusted_last_duration = max(0.01, original_last_duration + duration_difference) # Ensure duration is not zero or negative
-                    image_duration_list_final[last_image_index] = (image_duration_list_final[last_image_index][0], adjusted_last_duration)
-                    logger.debug(f"마지막 이미지 지속 시간 조정: {original_last_duration:.2f}s -> {adjusted_last_duration:.2f}s. 총 영상 길이 차이: {duration_difference:.2f}s")
-
-                # 특정 지속 시간을 가진 이미지 시퀀스 클립 생성 (조정된 지속 시간 사용)
-                images_in_order = [img_path for img_path, duration in image_duration_list_final]
-                durations_in_order = [duration for img_path, duration in image_duration_list_final]
-
-                if not images_in_order or not durations_in_order or len(images_in_order) != len(durations_in_order):
-                    logger.error(f"게시물 {post_id}에 대한 이미지 및 조정된 지속 시간 목록 불일치. 영상 생성 불가.")
-                else:
-                     logger.info(f"게시물 {post_id}에 대해 {len(images_in_order)}개의 이미지로 이미지 시퀀스 클립 생성 중. 총 지속 시간: {sum(durations_in_order):.2f}s")
-                     image_clip_sequence = ImageSequenceClip(images_in_order, durations=durations_in_order)
-
-                     # 이 게시물에 대한 VideoGenerator.generate_video 메소드 호출
-                     video_filename_base = post_id # 이 게시물에 대한 파일 이름 기본
-
-                     # 이 게시물의 출력 디렉토리에 대한 VideoGenerator 초기화
-                     video_gen_for_post = VideoGenerator(output_dir=post_video_output_dir)
-                     # generate_video 호출 시 조정된 image_duration_list_final 사용
-                     # 영상 생성 중 발생할 수 있는 예외 처리를 위해 try...except 블록 사용
-                     try:
-                         generated_video_path = video_gen_for_post.generate_video(image_duration_list_final, final_audio_clip, video_filename_base) # 파일 이름 기본 전달
-
-                         if generated_video_path:
-                             logger.info(f"게시물 {post_id}에 대한 영상 생성 성공: {generated_video_path}")
-                             total_videos_generated += 1
-                         else:
-                             logger.error(f"게시물 {post_id}에 대한 영상 생성 실패.")
-
-                     except Exception as e:
-                         logger.error(f"게시물 {post_id} 영상 생성 중 오류 발생: {e}")
-
-            # 처리된 오디오 클립이 없는 경우 (이전 로직 유지)
-            else:
-                logger.warning(f"게시물 {post_id}에 대한 처리된 오디오 클립이 없습니다. 영상에 오디오를 추가할 수 없습니다.")
-                # 오디오 없이 영상 생성 또는 건너뛰기 (선택 사항)
-                # 오디오 없이도 특정 지속 시간을 가진 이미지 시퀀스 클립 생성
-                images_in_order = [img_path for img_path, duration in image_duration_list_final]
-                durations_in_order = [duration for img_path, duration in image_duration_list_final]
-                if images_in_order and durations_in_order and len(images_in_order) == len(durations_in_order):
-                     logger.info(f"게시물 {post_id}에 대한 오디오 없는 영상 생성 중...")
-                     image_clip_sequence = ImageSequenceClip(images_in_order, durations=durations_in_order)
-                     video_gen_for_post = VideoGenerator(output_dir=post_video_output_dir) # 이 게시물의 출력 디렉토리에 대한 초기화
-                     video_filename_base = f"{post_id}_shorts_no_audio"
-                     generated_video_path = video_gen_for_post.generate_video(image_duration_list_final, None, video_filename_base) # audio_clip에 None 전달
-
-                     if generated_video_path:
-                         logger.warning(f"게시물 {post_id}에 대한 오디오 없는 영상 생성 완료: {generated_video_path}")
-                     else:
-                          logger.error(f"게시물 {post_id}에 대한 오디오 없는 영상 생성 실패.")
-                else:
-                    logger.warning(f"게시물 {post_id}에 대한 이미지 또는 지속 시간 누락으로 오디오 없는 영상 생성을 건너뜁니다.")
+                logger.error(f"게시물 처리 워커에서 오류 발생: {e}")
+                continue
+            total_posts_processed += post_processed
+            total_videos_generated += video_generated
 
     logger.info("\n영상 생성 스크립트 완료.")
     logger.info(f"총 처리된 게시물 수: {total_posts_processed}")